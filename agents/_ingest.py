@@ -0,0 +1,161 @@
+"""
+agents/_ingest.py — Shared metric submission helper for the RecSignal agents.
+
+Copy this file into the same directory as unix_agent.py / oracle_agent.py;
+both agents import it to ship their readings to the backend.
+
+Collectors add ``(metric_type, value, label)`` tuples to a :class:`Batcher`,
+which submits them to ``/metrics/ingest`` as a single POST when closed.  The
+backend therefore sees one request (and one DB transaction) per agent run,
+however many collectors contributed to it.
+
+Environment variables
+---------------------
+RECSIGNAL_API_URL   : URL of the RecSignal backend  (default: http://recsignal-backend:8000)
+RECSIGNAL_API_KEY   : Optional bearer token
+AGENT_TIMEOUT       : HTTP timeout in seconds        (default: 30)
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+from typing import Iterable, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+
+    _dumps = orjson.dumps
+except ImportError:  # orjson is optional on the monitored hosts
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+API_URL = os.getenv("RECSIGNAL_API_URL", "http://recsignal-backend:8000")
+API_KEY = os.getenv("RECSIGNAL_API_KEY", "")
+TIMEOUT_SECONDS = int(os.getenv("AGENT_TIMEOUT", "30"))
+
+# One reading as produced by a collector: (metric_type, value, label).  Kept
+# as a tuple in memory; expanded to the JSON object shape only on submit.
+Metric = tuple[str, float, str]
+
+# Bodies above this size are gzip-compressed (level 1: cheap, still 5-10x on
+# repetitive metric JSON).
+GZIP_MIN_BYTES = 4096
+
+_INGEST_URL = f"{API_URL.rstrip('/')}/metrics/ingest"
+_INGEST_HEADERS = {
+    "Content-Type": "application/json",
+    "Connection": "keep-alive",
+    **({"Authorization": f"Bearer {API_KEY}"} if API_KEY else {}),
+}
+_INGEST_GZIP_HEADERS = {**_INGEST_HEADERS, "Content-Encoding": "gzip"}
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------------------------
+# HTTP session (keep-alive + retry on transient gateway errors)
+# ---------------------------------------------------------------------------
+
+_RETRY = Retry(
+    total=2,
+    backoff_factor=0.3,
+    status_forcelist=[502, 503, 504],
+    allowed_methods=frozenset({"POST"}),
+)
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=_RETRY))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2, max_retries=_RETRY))
+
+
+def post_metrics(payload: dict) -> bool:
+    """HTTP POST payload to /metrics/ingest. Returns True on success."""
+    body = _dumps(payload)
+    headers = _INGEST_HEADERS
+    if len(body) > GZIP_MIN_BYTES:
+        body = gzip.compress(body, compresslevel=1)
+        headers = _INGEST_GZIP_HEADERS
+
+    try:
+        resp = _SESSION.post(_INGEST_URL, data=body, headers=headers, timeout=TIMEOUT_SECONDS)
+        resp.raise_for_status()
+        logger.info(
+            "Submitted %d metrics → %s stored",
+            len(payload["metrics"]),
+            resp.headers.get("X-Metrics-Stored", "0"),
+        )
+        return True
+    except requests.RequestException as exc:
+        logger.error("Failed to post metrics to %s: %s", _INGEST_URL, exc)
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Batcher
+# ---------------------------------------------------------------------------
+
+class Batcher:
+    """
+    Buffers metrics for one (hostname, environment, server_type) and submits
+    them in a single POST on :meth:`close`.
+
+    Usage::
+
+        with Batcher(HOSTNAME, ENVIRONMENT, "UNIX") as batch:
+            batch.add(collect_memory())
+            batch.add(collect_cpu_load())
+        sys.exit(0 if batch.ok else 2)
+
+    Leaving the ``with`` block through an exception (including ``sys.exit``)
+    discards the buffer without posting.
+    """
+
+    def __init__(self, hostname: str, environment: str, server_type: str) -> None:
+        self.hostname = hostname
+        self.environment = environment
+        self.server_type = server_type
+        self.ok: Optional[bool] = None
+        self._metrics: list[Metric] = []
+        # Envelope built once; only "metrics" is swapped in per submission.
+        self._payload: dict = {
+            "hostname": hostname,
+            "environment": environment,
+            "server_type": server_type,
+            "metrics": [],
+        }
+
+    def __len__(self) -> int:
+        return len(self._metrics)
+
+    def add(self, metrics: Iterable[Metric]) -> None:
+        """Append the readings returned by a collector."""
+        self._metrics.extend(metrics)
+
+    def close(self) -> bool:
+        """POST everything buffered so far. Returns True on success."""
+        if not self._metrics:
+            self.ok = False
+            return False
+        self._payload["metrics"] = [
+            {"metric_type": t, "value": v, "label": l} for t, v, l in self._metrics
+        ]
+        self.ok = post_metrics(self._payload)
+        self._metrics = []
+        return self.ok
+
+    def __enter__(self) -> "Batcher":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
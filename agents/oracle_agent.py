@@ -16,6 +16,13 @@ ORA_HOSTNAME    : Logical name for this DB server   (default: ORA_DSN host part)
 RECSIGNAL_API_URL : RecSignal backend URL           (default: http://recsignal-backend:8000)
 RECSIGNAL_ENV   : DEV | UAT | PROD                 (default: DEV)
 RECSIGNAL_API_KEY : Optional bearer token
+
+Database prerequisites
+----------------------
+The health query is re-parsed on every run.  Keep it a cheap soft parse by
+leaving ``session_cached_cursors`` non-zero on the monitored instance, e.g.::
+
+    ALTER SYSTEM SET session_cached_cursors = 50 SCOPE = SPFILE;
 """
 
 from __future__ import annotations
@@ -23,9 +30,12 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from logging.handlers import MemoryHandler
+from typing import Optional
 
 import oracledb
-import requests
+
+from _ingest import Batcher, Metric
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -39,16 +49,30 @@ ORA_DSN = os.environ["ORA_DSN"]
 _dsn_host = ORA_DSN.split(":")[0] if ":" in ORA_DSN else ORA_DSN
 ORA_HOSTNAME = os.getenv("ORA_HOSTNAME", f"oracle-{_dsn_host}")
 
-API_URL = os.getenv("RECSIGNAL_API_URL", "http://recsignal-backend:8000")
 ENVIRONMENT = os.getenv("RECSIGNAL_ENV", "DEV").upper()
-API_KEY = os.getenv("RECSIGNAL_API_KEY", "")
-TIMEOUT_SECONDS = int(os.getenv("AGENT_TIMEOUT", "30"))
 
-logging.basicConfig(
-    stream=sys.stdout,
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)-8s | oracle_agent | %(message)s",
+# Client-side statement cache per connection; the agent only ever runs a
+# handful of fixed statements, so a small cache holds all of them.
+STMT_CACHE_SIZE = 20
+
+# Rows per fetch round-trip.  Comfortably above the number of tablespaces on
+# any monitored instance, so the health query comes back in a single trip;
+# prefetchrows = arraysize + 1 lets the execute itself carry the rows and the
+# end-of-fetch marker.
+FETCH_ARRAYSIZE = 500
+
+# None of the monitoring queries return LOBs; fetch them as str/bytes if one
+# ever appears instead of allocating LOB locators.
+oracledb.defaults.fetch_lobs = False
+
+# Records are buffered and written to stdout in one go at exit (or as soon as
+# an ERROR is logged), instead of one write per call.
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(
+    logging.Formatter("%(asctime)s | %(levelname)-8s | oracle_agent | %(message)s")
 )
+_log_buffer = MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=_log_stream)
+logging.basicConfig(level=logging.INFO, handlers=[_log_buffer])
 logger = logging.getLogger("oracle_agent")
 
 
@@ -56,10 +80,36 @@ logger = logging.getLogger("oracle_agent")
 # SQL queries
 # ---------------------------------------------------------------------------
 
-_SQL_TABLESPACE = """
-SELECT
-    df.tablespace_name,
-    ROUND(NVL(df.total_mb - fs.free_mb, df.total_mb) / df.total_mb * 100, 2) AS pct_used
+# V$SYSMETRIC (60-second interval, GROUP_ID = 2) metrics forwarded by the
+# agent: METRIC_NAME -> (RecSignal metric type, label).  Only names that map
+# onto an existing RecSignal metric type belong here.  Blocking sessions,
+# long-running SQL and tablespace fill have no V$SYSMETRIC equivalent and keep
+# their own branches below.
+_SYSMETRIC_MAP: dict[str, tuple[str, str]] = {
+    "Host CPU Utilization (%)": ("CPU_LOAD", "HOST_CPU"),
+}
+
+
+def _sysmetric_branch() -> str:
+    """Build the V$SYSMETRIC leg of the health query from _SYSMETRIC_MAP."""
+    type_cases = " ".join(f"WHEN '{n}' THEN '{t}'" for n, (t, _) in _SYSMETRIC_MAP.items())
+    label_cases = " ".join(f"WHEN '{n}' THEN '{l}'" for n, (_, l) in _SYSMETRIC_MAP.items())
+    names = ", ".join(f"'{n}'" for n in _SYSMETRIC_MAP)
+    return f"""
+SELECT CASE metric_name {type_cases} END, ROUND(value, 2), CASE metric_name {label_cases} END
+FROM   v$sysmetric
+WHERE  group_id = 2
+  AND  metric_name IN ({names})
+"""
+
+
+# All health checks travel in one statement: a single round-trip and a single
+# (soft) parse per run.  Columns are (metric_type, value, label) — the agent's
+# Metric tuple — so rows can be forwarded as fetched.
+_SQL_HEALTH = """
+SELECT 'TABLESPACE_USAGE' AS metric_type,
+       ROUND(NVL(df.total_mb - fs.free_mb, df.total_mb) / df.total_mb * 100, 2) AS value,
+       df.tablespace_name AS label
 FROM
     (SELECT tablespace_name, ROUND(SUM(bytes) / 1048576, 2) AS total_mb
      FROM dba_data_files GROUP BY tablespace_name) df
@@ -67,100 +117,48 @@ FROM
     (SELECT tablespace_name, ROUND(SUM(bytes) / 1048576, 2) AS free_mb
      FROM dba_free_space GROUP BY tablespace_name) fs
     ON df.tablespace_name = fs.tablespace_name
-ORDER BY pct_used DESC
-"""
-
-_SQL_BLOCKING = """
-SELECT COUNT(w.sid) AS blocked_sessions
+UNION ALL
+SELECT 'BLOCKING_SESSIONS', COUNT(w.sid), 'TOTAL'
 FROM   v$session w
 WHERE  w.blocking_session IS NOT NULL
-"""
-
-_SQL_LONG_RUNNING = """
-SELECT COUNT(*) AS long_queries
+UNION ALL
+SELECT 'LONG_RUNNING_QUERIES', COUNT(*), 'TOTAL'
 FROM   v$session s
 JOIN   v$sql q ON q.sql_id = s.sql_id
 WHERE  s.status   = 'ACTIVE'
   AND  s.type    != 'BACKGROUND'
   AND  q.elapsed_time > 300000000
-"""
+UNION ALL""" + _sysmetric_branch()
 
 
 # ---------------------------------------------------------------------------
-# Collection functions
+# Collection
 # ---------------------------------------------------------------------------
 
-def collect_tablespace(cursor: oracledb.Cursor) -> list[dict]:
-    """Return TABLESPACE_USAGE metrics for every tablespace."""
-    metrics = []
-    try:
-        cursor.execute(_SQL_TABLESPACE)
-        for ts_name, pct_used in cursor.fetchall():
-            metrics.append({
-                "metric_type": "TABLESPACE_USAGE",
-                "value": float(pct_used),
-                "label": ts_name,
-            })
-    except oracledb.DatabaseError as exc:
-        logger.error("Tablespace query failed: %s", exc)
-    return metrics
-
-
-def collect_blocking_sessions(cursor: oracledb.Cursor) -> list[dict]:
-    """Return BLOCKING_SESSIONS count as a single metric."""
-    try:
-        cursor.execute(_SQL_BLOCKING)
-        count = cursor.fetchone()[0]
-        return [{"metric_type": "BLOCKING_SESSIONS", "value": float(count), "label": "TOTAL"}]
-    except oracledb.DatabaseError as exc:
-        logger.error("Blocking session query failed: %s", exc)
-        return []
-
-
-def collect_long_running_queries(cursor: oracledb.Cursor) -> list[dict]:
-    """Return LONG_RUNNING_QUERIES count (> 5 min) as a single metric."""
+def _number_as_float(cursor: oracledb.Cursor, metadata) -> Optional[oracledb.Var]:
+    """Output type handler: fetch every NUMBER column straight into a float."""
+    if metadata.type_code == oracledb.DB_TYPE_NUMBER:
+        return cursor.var(float, arraysize=cursor.arraysize)
+    return None
+
+
+def collect_health(cursor: oracledb.Cursor) -> list[Metric]:
+    """
+    Return TABLESPACE_USAGE (one per tablespace), BLOCKING_SESSIONS,
+    LONG_RUNNING_QUERIES (> 5 min) and the mapped V$SYSMETRIC readings
+    (see ``_SYSMETRIC_MAP``) from a single query.
+    """
+    cursor.arraysize = FETCH_ARRAYSIZE
+    cursor.prefetchrows = FETCH_ARRAYSIZE + 1
+    cursor.outputtypehandler = _number_as_float
     try:
-        cursor.execute(_SQL_LONG_RUNNING)
-        count = cursor.fetchone()[0]
-        return [{"metric_type": "LONG_RUNNING_QUERIES", "value": float(count), "label": "TOTAL"}]
+        cursor.execute(_SQL_HEALTH)
+        return cursor.fetchall()
     except oracledb.DatabaseError as exc:
-        logger.error("Long running query failed: %s", exc)
+        logger.error("Health query failed: %s", exc)
         return []
 
 
-# ---------------------------------------------------------------------------
-# API submission
-# ---------------------------------------------------------------------------
-
-def post_metrics(metrics: list[dict]) -> bool:
-    """POST collected metrics to RecSignal backend."""
-    payload = {
-        "hostname": ORA_HOSTNAME,
-        "environment": ENVIRONMENT,
-        "server_type": "ORACLE",
-        "metrics": metrics,
-    }
-    url = f"{API_URL.rstrip('/')}/metrics/ingest"
-    headers = {"Content-Type": "application/json"}
-    if API_KEY:
-        headers["Authorization"] = f"Bearer {API_KEY}"
-
-    try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=TIMEOUT_SECONDS)
-        resp.raise_for_status()
-        data = resp.json()
-        logger.info(
-            "Submitted %d metrics → %d stored, %d alerts generated",
-            len(metrics),
-            data.get("metrics_stored", 0),
-            data.get("alerts_generated", 0),
-        )
-        return True
-    except requests.RequestException as exc:
-        logger.error("Failed to post metrics: %s", exc)
-        return False
-
-
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -169,30 +167,32 @@ def main() -> None:
     logger.info("=== RecSignal Oracle Agent — %s [%s] ===", ORA_HOSTNAME, ENVIRONMENT)
 
     try:
-        con = oracledb.connect(user=ORA_USER, password=ORA_PASSWORD, dsn=ORA_DSN)
+        con = oracledb.connect(
+            user=ORA_USER,
+            password=ORA_PASSWORD,
+            dsn=ORA_DSN,
+            stmtcachesize=STMT_CACHE_SIZE,
+        )
         logger.info("Connected to Oracle at %s", ORA_DSN)
     except oracledb.DatabaseError as exc:
         logger.critical("Cannot connect to Oracle: %s", exc)
         sys.exit(3)
 
-    cursor = con.cursor()
-    all_metrics: list[dict] = []
+    with Batcher(ORA_HOSTNAME, ENVIRONMENT, "ORACLE") as batch:
+        cursor = con.cursor()
+        try:
+            batch.add(collect_health(cursor))
+        finally:
+            cursor.close()
+            con.close()
 
-    try:
-        all_metrics.extend(collect_tablespace(cursor))
-        all_metrics.extend(collect_blocking_sessions(cursor))
-        all_metrics.extend(collect_long_running_queries(cursor))
-    finally:
-        cursor.close()
-        con.close()
-
-    if not all_metrics:
-        logger.warning("No metrics collected.")
-        sys.exit(1)
-
-    logger.info("Collected %d metric readings.", len(all_metrics))
-    success = post_metrics(all_metrics)
-    sys.exit(0 if success else 2)
+        if not batch:
+            logger.warning("No metrics collected.")
+            sys.exit(1)
+
+        logger.info("Collected %d metric readings.", len(batch))
+
+    sys.exit(0 if batch.ok else 2)
 
 
 if __name__ == "__main__":
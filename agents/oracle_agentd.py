@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+agents/oracle_agentd.py — Resident variant of the RecSignal Oracle agent.
+
+Instead of being started by cron, this process stays up and collects every
+``AGENT_INTERVAL`` seconds.  It creates a small oracledb connection pool once
+at startup and acquires a connection from it per cycle, so the TCP + Oracle
+authentication handshake is paid once instead of on every collection.
+
+Deploy next to oracle_agent.py and _ingest.py and run it under systemd (or any
+process supervisor)::
+
+    ExecStart=/usr/bin/python3 /opt/recsignal/oracle_agentd.py
+
+Environment variables
+---------------------
+Everything oracle_agent.py reads, plus:
+
+AGENT_INTERVAL  : Seconds between collections       (default: 300)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import signal
+import sys
+import threading
+
+import oracledb
+
+from _ingest import Batcher
+from oracle_agent import (
+    ENVIRONMENT,
+    ORA_DSN,
+    ORA_HOSTNAME,
+    ORA_PASSWORD,
+    ORA_USER,
+    STMT_CACHE_SIZE,
+    collect_health,
+)
+
+INTERVAL_SECONDS = int(os.getenv("AGENT_INTERVAL", "300"))
+
+logger = logging.getLogger("oracle_agentd")
+
+_stop = threading.Event()
+
+
+def _handle_signal(signum, frame) -> None:
+    logger.info("Received signal %d — stopping after the current cycle.", signum)
+    _stop.set()
+
+
+def run_once(pool: oracledb.ConnectionPool) -> bool:
+    """Collect one round of metrics over a pooled connection and POST them."""
+    with Batcher(ORA_HOSTNAME, ENVIRONMENT, "ORACLE") as batch:
+        try:
+            with pool.acquire() as con:
+                with con.cursor() as cursor:
+                    batch.add(collect_health(cursor))
+        except oracledb.DatabaseError as exc:
+            logger.error("Cannot acquire Oracle connection: %s", exc)
+
+        if not batch:
+            logger.warning("No metrics collected.")
+            return False
+
+        logger.info("Collected %d metric readings.", len(batch))
+
+    return bool(batch.ok)
+
+
+def main() -> None:
+    logger.info(
+        "=== RecSignal Oracle Agent (resident) — %s [%s] every %ds ===",
+        ORA_HOSTNAME, ENVIRONMENT, INTERVAL_SECONDS,
+    )
+    signal.signal(signal.SIGTERM, _handle_signal)
+    signal.signal(signal.SIGINT, _handle_signal)
+
+    try:
+        pool = oracledb.create_pool(
+            user=ORA_USER,
+            password=ORA_PASSWORD,
+            dsn=ORA_DSN,
+            min=1,
+            max=2,
+            increment=1,
+            stmtcachesize=STMT_CACHE_SIZE,
+        )
+        logger.info("Oracle pool created for %s", ORA_DSN)
+    except oracledb.DatabaseError as exc:
+        logger.critical("Cannot create Oracle pool: %s", exc)
+        sys.exit(3)
+
+    try:
+        while not _stop.is_set():
+            run_once(pool)
+            for handler in logging.getLogger().handlers:
+                handler.flush()  # emit this cycle's buffered log lines now
+            _stop.wait(INTERVAL_SECONDS)
+    finally:
+        pool.close(force=True)
+        logger.info("Oracle pool closed.")
+
+
+if __name__ == "__main__":
+    main()
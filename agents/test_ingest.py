@@ -27,6 +27,9 @@ def test(label, url, data=None):
             req = urllib.request.Request(url)
         with urllib.request.urlopen(req, timeout=10) as resp:
             result = resp.read().decode()
+            stored = resp.headers.get("X-Metrics-Stored")
+            if stored is not None:
+                result = f"{stored} stored"
             print(f"  ✓ HTTP {resp.status}: {result}")
             return True
     except urllib.error.HTTPError as e:
@@ -20,29 +20,47 @@ from __future__ import annotations
 import logging
 import os
 import platform
+import re
 import socket
-import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from logging.handlers import MemoryHandler
 from typing import Optional
 
-import requests
+from _ingest import Batcher, Metric
 
 # ---------------------------------------------------------------------------
 # Configuration
 # ---------------------------------------------------------------------------
 
-API_URL = os.getenv("RECSIGNAL_API_URL", "http://recsignal-backend:8000")
 ENVIRONMENT = os.getenv("RECSIGNAL_ENV", "DEV").upper()
-API_KEY = os.getenv("RECSIGNAL_API_KEY", "")
 HOSTNAME = os.getenv("AGENT_HOSTNAME", socket.getfqdn())
-TIMEOUT_SECONDS = int(os.getenv("AGENT_TIMEOUT", "30"))
 
-logging.basicConfig(
-    stream=sys.stdout,
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)-8s | unix_agent | %(message)s",
+# Logical CPU count is fixed for the life of the process.
+_CPU_COUNT = os.cpu_count() or 1
+
+# Pseudo / virtual filesystems to skip, matched against both the fstype and
+# the source device columns of /proc/mounts ("udev" and "none" only ever
+# appear as sources).
+_SKIP_FS = frozenset({
+    "tmpfs", "devtmpfs", "udev", "none", "proc", "sysfs", "cgroup", "overlay", "squashfs",
+})
+
+# The four /proc/meminfo fields we need, in kernel order, in one match.
+_MEMINFO_RE = re.compile(
+    rb"MemTotal:\s+(\d+).*?MemAvailable:\s+(\d+).*?SwapTotal:\s+(\d+).*?SwapFree:\s+(\d+)",
+    re.S,
+)
+
+# Records are buffered and written to stdout in one go at exit (or as soon as
+# an ERROR is logged), instead of one write per call.
+_log_stream = logging.StreamHandler(sys.stdout)
+_log_stream.setFormatter(
+    logging.Formatter("%(asctime)s | %(levelname)-8s | unix_agent | %(message)s")
 )
+_log_buffer = MemoryHandler(capacity=100, flushLevel=logging.ERROR, target=_log_stream)
+logging.basicConfig(level=logging.INFO, handlers=[_log_buffer])
 logger = logging.getLogger("unix_agent")
 
 
@@ -50,129 +68,101 @@ logger = logging.getLogger("unix_agent")
 # Metric collection helpers
 # ---------------------------------------------------------------------------
 
-def _run(cmd: list[str], timeout: int = 10) -> str:
-    """Run a shell command and return stdout. Returns '' on failure."""
+def _read_proc(path: str) -> bytes:
+    """Read a procfs file with raw os-level calls (no buffered/text I/O objects)."""
+    fd = os.open(path, os.O_RDONLY | os.O_CLOEXEC)
     try:
-        return subprocess.check_output(cmd, stderr=subprocess.DEVNULL, timeout=timeout).decode()
-    except Exception as exc:
-        logger.warning("Command %s failed: %s", cmd, exc)
-        return ""
+        chunks = []
+        while chunk := os.read(fd, 65536):
+            chunks.append(chunk)
+        return b"".join(chunks)
+    finally:
+        os.close(fd)
 
 
-def collect_disk_usage() -> list[dict]:
-    """
-    Parse ``df -Ph`` output.
-    Returns list of {metric_type, value, label} dicts.
+def _unescape_mount(path: str) -> str:
+    """Decode the octal escapes (``\\040`` for space, etc.) used in /proc/mounts."""
+    return re.sub(r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), path)
+
+
+def collect_filesystems() -> list[Metric]:
     """
-    output = _run(["df", "-Ph"])
-    metrics = []
-    for line in output.splitlines()[1:]:
-        parts = line.split()
-        if len(parts) < 6:
-            continue
-        try:
-            pct = float(parts[4].replace("%", ""))
-        except ValueError:
-            continue
-        mount = parts[5]
-        # Skip pseudo-filesystems
-        if any(skip in parts[0] for skip in ["tmpfs", "devtmpfs", "udev", "none"]):
-            continue
-        metrics.append({"metric_type": "DISK_USAGE", "value": pct, "label": mount})
-    return metrics
+    Return DISK_USAGE and INODE_USAGE for every real mounted filesystem.
 
+    Walks ``/proc/mounts`` once and calls ``os.statvfs`` per mount point,
+    deriving both percentages from the same struct (no ``df`` subprocesses).
+    Percentages follow ``df -P`` semantics: used / (used + available to users).
+    """
+    try:
+        mounts = _read_proc("/proc/mounts").decode().splitlines()
+    except OSError as exc:
+        logger.error("Filesystem collection failed: %s", exc)
+        return []
 
-def collect_inode_usage() -> list[dict]:
-    """Parse ``df -Pi`` for inode usage percentages."""
-    output = _run(["df", "-Pi"])
-    metrics = []
-    for line in output.splitlines()[1:]:
+    seen: dict[str, tuple[float, Optional[float]]] = {}
+    for line in mounts:
         parts = line.split()
-        if len(parts) < 6 or parts[4] == "-":
+        if len(parts) < 3:
             continue
+        if parts[2] in _SKIP_FS or parts[0] in _SKIP_FS:
+            continue
+        mount = _unescape_mount(parts[1])
         try:
-            pct = float(parts[4].replace("%", ""))
-        except ValueError:
+            st = os.statvfs(mount)
+        except OSError:
             continue
-        mount = parts[5]
-        metrics.append({"metric_type": "INODE_USAGE", "value": pct, "label": mount})
+        if st.f_blocks == 0:
+            continue  # pseudo-filesystem (df hides these too)
+
+        used = st.f_blocks - st.f_bfree
+        denom = used + st.f_bavail
+        disk_pct = round(used / denom * 100, 2) if denom else 0.0
+        inode_pct = (
+            round((st.f_files - st.f_ffree) / st.f_files * 100, 2) if st.f_files else None
+        )
+        seen[mount] = (disk_pct, inode_pct)  # last mount on a path wins, as with df
+
+    metrics: list[Metric] = []
+    for mount, (disk_pct, _) in seen.items():
+        metrics.append(("DISK_USAGE", disk_pct, mount))
+    for mount, (_, inode_pct) in seen.items():
+        if inode_pct is not None:
+            metrics.append(("INODE_USAGE", inode_pct, mount))
     return metrics
 
 
-def collect_memory() -> list[dict]:
+def collect_memory() -> list[Metric]:
     """Read /proc/meminfo for RAM and swap percentages."""
     try:
-        mem: dict[str, int] = {}
-        with open("/proc/meminfo") as f:
-            for line in f:
-                k, _, v = line.partition(":")
-                mem[k.strip()] = int(v.split()[0])
-
-        total = mem.get("MemTotal", 1)
-        avail = mem.get("MemAvailable", 0)
-        mem_pct = round((1 - avail / total) * 100, 2)
-
-        swap_total = mem.get("SwapTotal", 0)
-        swap_free = mem.get("SwapFree", 0)
+        m = _MEMINFO_RE.search(_read_proc("/proc/meminfo"))
+        if m is None:
+            raise ValueError("MemTotal/MemAvailable/SwapTotal/SwapFree not found")
+        total, avail, swap_total, swap_free = (int(g) for g in m.groups())
+
+        mem_pct = round((1 - avail / (total or 1)) * 100, 2)
         swap_pct = round((1 - swap_free / swap_total) * 100, 2) if swap_total else 0.0
 
         return [
-            {"metric_type": "MEMORY_USAGE", "value": mem_pct, "label": "RAM"},
-            {"metric_type": "MEMORY_USAGE", "value": swap_pct, "label": "SWAP"},
+            ("MEMORY_USAGE", mem_pct, "RAM"),
+            ("MEMORY_USAGE", swap_pct, "SWAP"),
         ]
     except Exception as exc:
         logger.error("Memory collection failed: %s", exc)
         return []
 
 
-def collect_cpu_load() -> list[dict]:
+def collect_cpu_load() -> list[Metric]:
     """Return 1-minute load average as CPU percentage."""
     try:
-        with open("/proc/loadavg") as f:
-            load_1m = float(f.read().split()[0])
-        cpu_count = int(_run(["nproc"]).strip() or "1")
-        pct = min(round((load_1m / cpu_count) * 100, 2), 100.0)
-        return [{"metric_type": "CPU_LOAD", "value": pct, "label": "LOAD_1M"}]
+        load_1m = float(_read_proc("/proc/loadavg").split()[0])
+        pct = min(round((load_1m / _CPU_COUNT) * 100, 2), 100.0)
+        return [("CPU_LOAD", pct, "LOAD_1M")]
     except Exception as exc:
         logger.error("CPU load collection failed: %s", exc)
         return []
 
 
-# ---------------------------------------------------------------------------
-# API submission
-# ---------------------------------------------------------------------------
-
-def build_payload(metrics: list[dict]) -> dict:
-    """Wrap collected metrics into the backend ingest schema."""
-    return {
-        "hostname": HOSTNAME,
-        "environment": ENVIRONMENT,
-        "server_type": "UNIX",
-        "metrics": metrics,
-    }
-
-
-def post_metrics(payload: dict) -> bool:
-    """HTTP POST payload to /metrics/ingest. Returns True on success."""
-    url = f"{API_URL.rstrip('/')}/metrics/ingest"
-    headers = {"Content-Type": "application/json"}
-    if API_KEY:
-        headers["Authorization"] = f"Bearer {API_KEY}"
-
-    try:
-        resp = requests.post(url, json=payload, headers=headers, timeout=TIMEOUT_SECONDS)
-        resp.raise_for_status()
-        data = resp.json()
-        logger.info(
-            "Submitted %d metrics → %d stored, %d alerts generated",
-            len(payload["metrics"]),
-            data.get("metrics_stored", 0),
-            data.get("alerts_generated", 0),
-        )
-        return True
-    except requests.RequestException as exc:
-        logger.error("Failed to post metrics to %s: %s", url, exc)
-        return False
+COLLECTORS = (collect_filesystems, collect_memory, collect_cpu_load)
 
 
 # ---------------------------------------------------------------------------
@@ -182,20 +172,20 @@ def post_metrics(payload: dict) -> bool:
 def main() -> None:
     logger.info("=== RecSignal Unix Agent — %s [%s] ===", HOSTNAME, ENVIRONMENT)
 
-    all_metrics: list[dict] = []
-    all_metrics.extend(collect_disk_usage())
-    all_metrics.extend(collect_inode_usage())
-    all_metrics.extend(collect_memory())
-    all_metrics.extend(collect_cpu_load())
+    with Batcher(HOSTNAME, ENVIRONMENT, "UNIX") as batch:
+        # Collectors are I/O bound (statvfs on possibly slow/network mounts,
+        # procfs reads), so run them side by side; map() keeps their order.
+        with ThreadPoolExecutor(max_workers=len(COLLECTORS)) as pool:
+            for metrics in pool.map(lambda collect: collect(), COLLECTORS):
+                batch.add(metrics)
+
+        if not batch:
+            logger.warning("No metrics collected. Exiting.")
+            sys.exit(1)
 
-    if not all_metrics:
-        logger.warning("No metrics collected. Exiting.")
-        sys.exit(1)
+        logger.info("Collected %d metric readings.", len(batch))
 
-    logger.info("Collected %d metric readings.", len(all_metrics))
-    payload = build_payload(all_metrics)
-    success = post_metrics(payload)
-    sys.exit(0 if success else 2)
+    sys.exit(0 if batch.ok else 2)
 
 
 if __name__ == "__main__":
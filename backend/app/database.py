@@ -15,6 +15,10 @@ import logging
 import os
 from contextlib import contextmanager
 
+from fastapi import Depends, HTTPException
+
+from app.telemetry import acquire_connection
+
 logger = logging.getLogger(__name__)
 
 # ---------------------------------------------------------------------------
@@ -31,9 +35,33 @@ DB_DSN            = os.getenv("DB_DSN",       "localhost:1521/XEPDB1")
 DB_POOL_MIN       = int(os.getenv("DB_POOL_MIN",  "0"))
 DB_POOL_MAX       = int(os.getenv("DB_POOL_MAX",  "10"))
 DB_POOL_INCREMENT = int(os.getenv("DB_POOL_INCREMENT", "1"))
+# Per-connection statement cache; must hold every distinct SQL text the API
+# issues so each is soft-parsed once per connection.  That is roughly 60
+# today: list_alerts alone has up to 16 filter variants, list_servers 8.
+DB_STMT_CACHE_SIZE = int(os.getenv("DB_STMT_CACHE_SIZE", "100"))
+# How long pool.acquire() waits for a free connection (ms) before failing,
+# which the request dependency turns into a 503 instead of a hung worker.
+DB_POOL_WAIT_TIMEOUT = int(os.getenv("DB_POOL_WAIT_TIMEOUT", "5000"))
 
 _oracle_pool = None  # initialised by init_db() when DB_TYPE=oracle
 
+
+class DatabaseUnavailable(RuntimeError):
+    """Raised by :func:`get_connection` when no pooled connection can be had."""
+
+
+# Resolve the backend module once at import time rather than on every request.
+if DB_TYPE == "oracle":
+    import oracledb
+else:
+    oracledb = None
+    from app.sqlite_adapter import (
+        close_sqlite_pool,
+        get_sqlite_connection,
+        get_sqlite_db,
+        init_sqlite,
+    )
+
 # ---------------------------------------------------------------------------
 # init_db — called once at FastAPI startup
 # ---------------------------------------------------------------------------
@@ -41,7 +69,6 @@ _oracle_pool = None  # initialised by init_db() when DB_TYPE=oracle
 def init_db() -> None:
     """Initialise the chosen database backend."""
     if DB_TYPE == "sqlite":
-        from app.sqlite_adapter import init_sqlite
         init_sqlite()
         logger.info("Using SQLite dev database (DB_TYPE=sqlite).")
     else:
@@ -51,7 +78,6 @@ def init_db() -> None:
 def _init_oracle() -> None:
     global _oracle_pool
     try:
-        import oracledb
         _oracle_pool = oracledb.create_pool(
             user=DB_USER,
             password=DB_PASSWORD,
@@ -59,6 +85,9 @@ def _init_oracle() -> None:
             min=DB_POOL_MIN,
             max=DB_POOL_MAX,
             increment=DB_POOL_INCREMENT,
+            stmtcachesize=DB_STMT_CACHE_SIZE,
+            getmode=oracledb.POOL_GETMODE_TIMEDWAIT,
+            wait_timeout=DB_POOL_WAIT_TIMEOUT,
         )
         logger.info("Oracle pool initialised (dsn=%s, user=%s)", DB_DSN, DB_USER)
     except Exception as exc:
@@ -76,30 +105,34 @@ def _init_oracle() -> None:
 def close_db() -> None:
     """Release resources on shutdown."""
     global _oracle_pool
-    if _oracle_pool:
+    if DB_TYPE == "sqlite":
+        close_sqlite_pool()
+    elif _oracle_pool:
         _oracle_pool.close()
         logger.info("Oracle connection pool closed.")
 
 
 # ---------------------------------------------------------------------------
-# get_connection — context manager (used during schema bootstrap in main.py)
+# get_connection — context manager (schema bootstrap, background tasks, and
+# endpoints that only sometimes need the database)
 # ---------------------------------------------------------------------------
 
 @contextmanager
 def get_connection():
     """Yield a DB connection (SQLite adapter or Oracle) as a context manager."""
     if DB_TYPE == "sqlite":
-        from app.sqlite_adapter import get_sqlite_connection
         with get_sqlite_connection() as con:
             yield con
     else:
         if _oracle_pool is None:
-            raise RuntimeError("Oracle pool not initialised.")
-        import oracledb
-        con = _oracle_pool.acquire()
+            raise DatabaseUnavailable("Oracle pool not initialised.")
+        try:
+            con = acquire_connection(_oracle_pool)
+        except Exception as exc:
+            raise DatabaseUnavailable(str(exc)) from exc
         try:
             yield con
-            con.commit()
+            _commit_if_pending(con)
         except Exception:
             con.rollback()
             raise
@@ -121,30 +154,64 @@ def get_db():
         def example(con = Depends(get_db)):
             cursor = con.cursor()
             ...
+
+    Routes that only need a cursor should depend on :func:`get_cursor`.
     """
     if DB_TYPE == "sqlite":
-        from app.sqlite_adapter import get_sqlite_db
         yield from get_sqlite_db()
     else:
         yield from _get_oracle_db()
 
 
+def get_cursor(con=Depends(get_db, scope="function")):
+    """
+    FastAPI dependency that yields a cursor on the request's connection and
+    closes it on teardown, ahead of the connection's commit and release.
+
+    Depend on it with ``scope="function"`` so the connection goes back to the
+    pool as soon as the endpoint returns.  With the default request scope it
+    is held until background tasks finish, and a task that acquires its own
+    connection then needs two at once — enough concurrent requests and the
+    pool is exhausted by connections waiting on themselves.
+
+    Usage::
+
+        @router.get("/example")
+        def example(cursor = Depends(get_cursor, scope="function")):
+            cursor.execute(...)
+    """
+    cursor = con.cursor()
+    try:
+        yield cursor
+    finally:
+        cursor.close()
+
+
 def _get_oracle_db():
     if _oracle_pool is None:
-        from fastapi import HTTPException
         raise HTTPException(503, "Database unavailable — Oracle pool not initialised.")
-    import oracledb
     try:
-        con = _oracle_pool.acquire()
+        con = acquire_connection(_oracle_pool)
     except Exception as exc:
-        from fastapi import HTTPException
         raise HTTPException(503, f"Database unavailable: {exc}")
     try:
         yield con
-        con.commit()
+        _commit_if_pending(con)
     except Exception:
         con.rollback()
         raise
     finally:
         _oracle_pool.release(con)
 
+
+def _commit_if_pending(con) -> None:
+    """
+    Commit only if the connection has uncommitted work.
+
+    Autocommit stays off and writes are committed once, at the end of the
+    request (or earlier by the route itself, as ingest does).  Read-only
+    requests and already-committed ones then skip the commit round-trip.
+    """
+    if con.transaction_in_progress:
+        con.commit()
+
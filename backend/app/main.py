@@ -12,16 +12,26 @@ Startup sequence
 from __future__ import annotations
 
 import logging
+import os
+import re
 import sys
+import time
 from contextlib import asynccontextmanager
+from typing import Optional
 
 import oracledb
-from fastapi import Depends, FastAPI
+from anyio import to_thread
+from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 
-from app.database import close_db, get_db, init_db
-from app.models import DDL_STATEMENTS, DashboardStats
+from app.database import DatabaseUnavailable, close_db, get_connection, init_db
+from app.middleware import GzipRequestMiddleware
+from app.models import DDL_STATEMENTS, DEFAULT_THRESHOLDS, DashboardStats
 from app.routes import alerts, config, metrics, servers
+from app.telemetry import metrics_app
 
 # ---------------------------------------------------------------------------
 # Logging
@@ -34,33 +44,82 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Route handlers are sync (the DB layer is a blocking driver) and run on
+# AnyIO's worker threadpool, 40 threads by default.  Keep it comfortably
+# above DB_POOL_MAX so requests not waiting on a connection (cache hits,
+# /health, 404s) are never queued behind ones that are.
+API_THREADPOOL_SIZE = int(os.getenv("API_THREADPOOL_SIZE", "40"))
+
 
 # ---------------------------------------------------------------------------
 # DB schema bootstrap (idempotent)
 # ---------------------------------------------------------------------------
 
+_CREATE_OBJECT_RE = re.compile(r"\s*CREATE\s+(TABLE|INDEX|SEQUENCE)\s+(\w+)", re.IGNORECASE)
+
+# Error codes that just mean "already applied" and are expected on every
+# startup after the first.
+_BENIGN_DDL_CODES = frozenset({
+    955,   # name already used by existing object
+    1,     # unique constraint violated (seed INSERT)
+    1430,  # column being added already exists in table
+    2443,  # cannot drop constraint — nonexistent
+    2441,  # constraint already exists
+    2264,  # name already used by an existing constraint
+})
+
+
 def _bootstrap_schema(con: oracledb.Connection) -> None:
     """
     Execute all DDL statements defined in models.DDL_STATEMENTS.
-    ORA-00955 (name already used) is silently ignored so the function
-    is safe to run on every startup.
+
+    Existing tables, indexes and sequences are looked up once in USER_OBJECTS
+    and their CREATE statements are skipped, so a steady-state startup only
+    replays the idempotent migrations.  models.DEFAULT_THRESHOLDS is then
+    seeded with one array-bound executemany; rows that already exist fail
+    individually (ORA-00001) without affecting the rest.  Expected "already
+    applied" errors are ignored; anything else is collected and logged once
+    at the end.  DDL auto-commits in Oracle and the caller commits the seed
+    rows, so no per-statement commit is issued.
     """
     cursor = con.cursor()
+    cursor.execute(
+        "SELECT object_type, object_name FROM user_objects "
+        "WHERE object_type IN ('TABLE', 'INDEX', 'SEQUENCE')"
+    )
+    existing = frozenset(cursor.fetchall())
+
+    skipped = 0
+    errors: list[tuple[int, str]] = []
     for stmt in DDL_STATEMENTS:
+        stmt = stmt.strip()
+        m = _CREATE_OBJECT_RE.match(stmt)
+        if m and (m.group(1).upper(), m.group(2).upper()) in existing:
+            skipped += 1
+            continue
         try:
-            cursor.execute(stmt.strip())
-            con.commit()
+            cursor.execute(stmt)
         except oracledb.DatabaseError as exc:
             (error,) = exc.args
-            if error.code in (955, 1, 1430, 2443, 2441):
-                # 955  = name already used by existing object
-                # 1    = unique constraint violated (seed INSERT)
-                # 1430 = column being added already exists in table
-                # 2443 = cannot drop constraint — nonexistent
-                # 2441 = constraint already exists
-                pass
-            else:
-                logger.warning("DDL warning (code %d): %s", error.code, error.message)
+            if error.code not in _BENIGN_DDL_CODES:
+                errors.append((error.code, error.message))
+
+    cursor.executemany(
+        "INSERT INTO config (metric_type, environment, warning_threshold, critical_threshold) "
+        "VALUES (:1, :2, :3, :4)",
+        DEFAULT_THRESHOLDS,
+        batcherrors=True,
+    )
+    for error in cursor.getbatcherrors():
+        if error.code not in _BENIGN_DDL_CODES:
+            errors.append((error.code, error.message))
+
+    logger.info(
+        "Schema bootstrap: %d statements, %d skipped (object exists), %d errors",
+        len(DDL_STATEMENTS), skipped, len(errors),
+    )
+    for code, message in errors:
+        logger.warning("DDL warning (code %d): %s", code, message)
 
 
 # ---------------------------------------------------------------------------
@@ -71,6 +130,7 @@ def _bootstrap_schema(con: oracledb.Connection) -> None:
 async def lifespan(app: FastAPI):
     """FastAPI lifespan: runs setup on startup, teardown on shutdown."""
     logger.info("RecSignal starting up …")
+    to_thread.current_default_thread_limiter().total_tokens = API_THREADPOOL_SIZE
     try:
         init_db()
     except Exception as exc:
@@ -81,7 +141,6 @@ async def lifespan(app: FastAPI):
     from app.database import DB_TYPE
     if DB_TYPE == "oracle":
         try:
-            from app.database import get_connection
             with get_connection() as con:
                 _bootstrap_schema(con)
             logger.info("Oracle schema bootstrap complete.")
@@ -105,6 +164,7 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/docs",
     redoc_url="/redoc",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS — allow the React dev server and production origin
@@ -116,6 +176,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger responses; inflate gzip-encoded agent ingest batches.
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(GzipRequestMiddleware)
+
 # ---------------------------------------------------------------------------
 # Routers
 # ---------------------------------------------------------------------------
@@ -125,67 +189,79 @@ app.include_router(metrics.router)
 app.include_router(alerts.router)
 app.include_router(config.router)
 
+# Prometheus scrape endpoint (only when prometheus_client is installed).  Not
+# under /metrics, which is the RecSignal metrics API.
+_prometheus_app = metrics_app()
+if _prometheus_app is not None:
+    app.mount("/prometheus", _prometheus_app)
+
 
 # ---------------------------------------------------------------------------
 # Dashboard aggregate endpoint
 # ---------------------------------------------------------------------------
 
-@app.get("/dashboard", response_model=DashboardStats, tags=["Dashboard"])
-def dashboard(con: oracledb.Connection = Depends(get_db)):
-    """
-    Returns a high-level dashboard summary:
-    - total server count
-    - open alert counts by severity
-    - server counts per environment
-    - 10 most-recent open/acknowledged alerts
-    """
-    cursor = con.cursor()
-
-    # Total servers
-    cursor.execute("SELECT COUNT(*) FROM servers WHERE active = 1")
-    total_servers = cursor.fetchone()[0]
+# Dashboards poll this endpoint from every open browser tab; serve a shared
+# snapshot for a few seconds instead of re-running the queries per poll.
+# The cache is per worker process.
+_DASHBOARD_TTL_SECONDS = 5.0
+_dash_cache: Optional[tuple[float, DashboardStats]] = None
+
+_SQL_DASHBOARD_COUNTS = """
+SELECT 'TOTAL' AS k, NULL AS sub, COUNT(*) AS v FROM servers WHERE active = 1
+UNION ALL
+SELECT 'SEV', severity, COUNT(*)
+FROM   alerts
+WHERE  status IN ('OPEN', 'ACKNOWLEDGED')
+GROUP BY severity
+UNION ALL
+SELECT 'ENV', environment, COUNT(*) FROM servers WHERE active = 1 GROUP BY environment
+"""
 
-    # Alert counts
-    cursor.execute(
-        """
-        SELECT severity, COUNT(*)
-        FROM   alerts
-        WHERE  status IN ('OPEN', 'ACKNOWLEDGED')
-        GROUP BY severity
-        """
-    )
-    alert_counts: dict[str, int] = {}
-    for row in cursor.fetchall():
-        alert_counts[row[0]] = row[1]
 
-    # Servers by environment
-    cursor.execute(
-        "SELECT environment, COUNT(*) FROM servers WHERE active = 1 GROUP BY environment"
-    )
-    servers_by_env: dict[str, int] = {}
-    for row in cursor.fetchall():
-        servers_by_env[row[0]] = row[1]
-
-    # Recent alerts
-    cursor.execute(
-        """
-        SELECT a.id, a.server_id, a.metric, a.severity, a.label,
-               a.value, a.message, a.status, a.acknowledged_by,
-               a.created_at, a.resolved_at
-        FROM   alerts a
-        WHERE  a.status IN ('OPEN', 'ACKNOWLEDGED')
-        ORDER BY a.created_at DESC
-        FETCH FIRST 10 ROWS ONLY
-        """
-    )
-    recent_alerts = [
-        {
-            "id": r[0], "server_id": r[1], "metric": r[2], "severity": r[3],
-            "label": r[4], "value": float(r[5]) if r[5] else 0.0, "message": r[6],
-            "status": r[7], "acknowledged_by": r[8], "created_at": r[9], "resolved_at": r[10],
-        }
-        for r in cursor.fetchall()
-    ]
+def _load_dashboard_stats() -> DashboardStats:
+    """Cache-miss path of :func:`dashboard`, on a connection of its own."""
+    with get_connection() as con:
+        return _dashboard_stats(con)
+
+
+def _dashboard_stats(con: oracledb.Connection) -> DashboardStats:
+    """Run the blocking dashboard queries on *con*."""
+    with con.cursor() as cursor:
+        # Server total, open alert counts by severity and servers by environment
+        # in one round-trip; rows are tagged by kind.
+        cursor.execute(_SQL_DASHBOARD_COUNTS)
+        total_servers = 0
+        alert_counts: dict[str, int] = {}
+        servers_by_env: dict[str, int] = {}
+        for kind, key, count in cursor.fetchall():
+            if kind == "TOTAL":
+                total_servers = count
+            elif kind == "SEV":
+                alert_counts[key] = count
+            else:
+                servers_by_env[key] = count
+
+        # Recent alerts
+        cursor.arraysize = 200
+        cursor.execute(
+            """
+            SELECT a.id, a.server_id, a.metric, a.severity, a.label,
+                   a.value, a.message, a.status, a.acknowledged_by,
+                   a.created_at, a.resolved_at
+            FROM   alerts a
+            WHERE  a.status IN ('OPEN', 'ACKNOWLEDGED')
+            ORDER BY a.created_at DESC
+            FETCH FIRST 10 ROWS ONLY
+            """
+        )
+        recent_alerts = [
+            {
+                "id": r[0], "server_id": r[1], "metric": r[2], "severity": r[3],
+                "label": r[4], "value": float(r[5]) if r[5] else 0.0, "message": r[6],
+                "status": r[7], "acknowledged_by": r[8], "created_at": r[9], "resolved_at": r[10],
+            }
+            for r in cursor.fetchall()
+        ]
 
     return DashboardStats(
         total_servers=total_servers,
@@ -197,6 +273,30 @@ def dashboard(con: oracledb.Connection = Depends(get_db)):
     )
 
 
+@app.get("/dashboard", response_model=DashboardStats, tags=["Dashboard"])
+async def dashboard():
+    """
+    Returns a high-level dashboard summary:
+    - total server count
+    - open alert counts by severity
+    - server counts per environment
+    - 10 most-recent open/acknowledged alerts
+
+    Results are cached for ``_DASHBOARD_TTL_SECONDS``; a connection is only
+    taken from the pool on a cache miss.
+    """
+    global _dash_cache
+    cached = _dash_cache
+    if cached is not None and time.monotonic() - cached[0] < _DASHBOARD_TTL_SECONDS:
+        return cached[1]
+    try:
+        stats = await run_in_threadpool(_load_dashboard_stats)
+    except DatabaseUnavailable as exc:
+        raise HTTPException(503, f"Database unavailable: {exc}")
+    _dash_cache = (time.monotonic(), stats)
+    return stats
+
+
 # ---------------------------------------------------------------------------
 # Health check
 # ---------------------------------------------------------------------------
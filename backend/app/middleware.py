@@ -0,0 +1,105 @@
+"""
+middleware.py — ASGI middleware for RecSignal.
+
+GzipRequestMiddleware
+    Transparently inflates request bodies sent with ``Content-Encoding: gzip``
+    (the agents compress large ingest batches) before they reach the routes.
+    Both the compressed and the inflated size are capped (413 beyond
+    either), since the ingest endpoint is unauthenticated and a few KB of
+    gzip can otherwise expand into gigabytes.
+"""
+
+from __future__ import annotations
+
+import logging
+import zlib
+
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+# An ingest batch of a few thousand readings is well under 1 MB of JSON and
+# compresses 5-10x; these leave ample headroom.
+MAX_COMPRESSED_BYTES = 8 * 1024 * 1024
+MAX_INFLATED_BYTES = 32 * 1024 * 1024
+
+
+class GzipRequestMiddleware:
+    """Decompress gzip-encoded HTTP request bodies."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_compressed: int = MAX_COMPRESSED_BYTES,
+        max_inflated: int = MAX_INFLATED_BYTES,
+    ) -> None:
+        self.app = app
+        self.max_compressed = max_compressed
+        self.max_inflated = max_inflated
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = scope["headers"]
+        if (b"content-encoding", b"gzip") not in headers:
+            await self.app(scope, receive, send)
+            return
+
+        chunks = []
+        received = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunk = message.get("body", b"")
+            received += len(chunk)
+            if received > self.max_compressed:
+                await self._reject(scope, receive, send, "compressed", self.max_compressed)
+                return
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+
+        # wbits 16 + MAX_WBITS: gzip header and trailer, like gzip.decompress,
+        # but with max_length bounding the output.
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            body = inflater.decompress(b"".join(chunks), self.max_inflated + 1)
+        except zlib.error as exc:
+            logger.warning("Rejected malformed gzip request body: %s", exc)
+            response = PlainTextResponse("Malformed gzip request body", status_code=400)
+            await response(scope, receive, send)
+            return
+        if len(body) > self.max_inflated:
+            await self._reject(scope, receive, send, "inflated", self.max_inflated)
+            return
+        if not inflater.eof or inflater.unused_data:
+            logger.warning("Rejected malformed gzip request body: truncated or trailing data")
+            response = PlainTextResponse("Malformed gzip request body", status_code=400)
+            await response(scope, receive, send)
+            return
+
+        scope = dict(scope)
+        scope["headers"] = [
+            (k, v) for k, v in headers if k not in (b"content-encoding", b"content-length")
+        ] + [(b"content-length", str(len(body)).encode())]
+
+        sent = False
+
+        async def receive_inflated() -> Message:
+            nonlocal sent
+            if sent:
+                return await receive()
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+
+        await self.app(scope, receive_inflated, send)
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, kind: str, limit: int) -> None:
+        logger.warning("Rejected gzip request body: %s size over %d bytes", kind, limit)
+        response = PlainTextResponse("Request body too large", status_code=413)
+        await response(scope, receive, send)
@@ -9,11 +9,12 @@ Sections
 
 from __future__ import annotations
 
+import sys
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # ---------------------------------------------------------------------------
@@ -55,11 +56,33 @@ class AlertStatus(str, Enum):
     RESOLVED = "RESOLVED"
 
 
+# Interned ``.value`` strings for the enums used as bind values on hot paths
+# (per-metric ingest, config lookups): a dict lookup instead of the Enum
+# ``value`` descriptor, and the same str object on every call.
+METRIC_VALUES: dict[MetricType, str] = {m: sys.intern(m.value) for m in MetricType}
+ENV_VALUES: dict[Environment, str] = {e: sys.intern(e.value) for e in Environment}
+
+
+# ---------------------------------------------------------------------------
+# Base model
+# ---------------------------------------------------------------------------
+
+class _Model(BaseModel):
+    """
+    Common base: core schemas are built on first use rather than at import.
+    Base/unused classes (``ServerBase``, ``AlertCreate``, …) are then never
+    built at all, and each worker process only pays for the models its routes
+    and TypeAdapters actually touch.
+    """
+
+    model_config = ConfigDict(defer_build=True)
+
+
 # ---------------------------------------------------------------------------
 # Server
 # ---------------------------------------------------------------------------
 
-class ServerBase(BaseModel):
+class ServerBase(_Model):
     hostname: str = Field(..., max_length=255)
     environment: Environment
     type: ServerType
@@ -73,15 +96,14 @@ class ServerCreate(ServerBase):
 class ServerResponse(ServerBase):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ---------------------------------------------------------------------------
 # Metrics
 # ---------------------------------------------------------------------------
 
-class MetricBase(BaseModel):
+class MetricBase(_Model):
     server_id: int
     metric_type: MetricType
     value: float = Field(..., description="Numeric metric value (e.g. percentage)")
@@ -97,15 +119,14 @@ class MetricResponse(MetricBase):
     id: int
     timestamp: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ---------------------------------------------------------------------------
 # Bulk metric ingestion (agent payload)
 # ---------------------------------------------------------------------------
 
-class MetricPayload(BaseModel):
+class MetricPayload(_Model):
     """
     Payload sent by Unix / Oracle agents.
     Contains server identification plus a list of metrics collected.
@@ -120,7 +141,7 @@ class MetricPayload(BaseModel):
 # Alerts
 # ---------------------------------------------------------------------------
 
-class AlertBase(BaseModel):
+class AlertBase(_Model):
     server_id: int
     metric: MetricType
     severity: Severity
@@ -140,11 +161,10 @@ class AlertResponse(AlertBase):
     resolved_at: Optional[datetime] = None
     acknowledged_by: Optional[str] = None
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
-class AlertAcknowledge(BaseModel):
+class AlertAcknowledge(_Model):
     alert_id: int
     acknowledged_by: str = Field(..., max_length=100)
 
@@ -153,7 +173,7 @@ class AlertAcknowledge(BaseModel):
 # Config (threshold management)
 # ---------------------------------------------------------------------------
 
-class ThresholdConfig(BaseModel):
+class ThresholdConfig(_Model):
     metric_type: MetricType
     environment: Environment
     hostname: str = Field(
@@ -173,15 +193,14 @@ class ThresholdConfig(BaseModel):
 class ThresholdConfigResponse(ThresholdConfig):
     id: int
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 # ---------------------------------------------------------------------------
 # Dashboard composite response
 # ---------------------------------------------------------------------------
 
-class DashboardStats(BaseModel):
+class DashboardStats(_Model):
     total_servers: int
     active_alerts: int
     critical_alerts: int
@@ -220,6 +239,8 @@ DDL_STATEMENTS = [
     """,
     # index for fast metric history queries
     "CREATE INDEX idx_metrics_server_ts ON metrics(server_id, timestamp DESC)",
+    # index for the latest-reading-per-metric query
+    "CREATE INDEX idx_metrics_latest ON metrics(server_id, metric_type, label, timestamp DESC)",
     # alerts
     """
     CREATE TABLE alerts (
@@ -237,6 +258,12 @@ DDL_STATEMENTS = [
         resolved_at     TIMESTAMP
     )
     """,
+    # newest-first alert listing: lets ORDER BY created_at DESC FETCH FIRST
+    # walk the index and stop after :lim rows, filtering on the trailing keys
+    "CREATE INDEX idx_alerts_created_desc ON alerts(created_at DESC, status, severity, server_id)",
+    # open-alert lookups during ingest (open-key scan, NOT EXISTS guard,
+    # auto-resolve) — all answered from the index without touching the table
+    "CREATE INDEX idx_alerts_open ON alerts(server_id, status, metric, label)",
     # config / thresholds
     """
     CREATE TABLE config (
@@ -247,7 +274,8 @@ DDL_STATEMENTS = [
         path_label          VARCHAR2(255) DEFAULT '' NOT NULL,
         warning_threshold   NUMBER(6,2)   NOT NULL,
         critical_threshold  NUMBER(6,2)   NOT NULL,
-        CONSTRAINT uq_config_path UNIQUE (metric_type, environment, hostname, path_label)
+        CONSTRAINT uq_config_path UNIQUE (metric_type, environment, hostname, path_label),
+        CONSTRAINT chk_config_thresholds CHECK (warning_threshold < critical_threshold)
     )
     """,
     # ── Migration: add hostname / path_label to existing config tables ──────
@@ -257,31 +285,38 @@ DDL_STATEMENTS = [
     "ALTER TABLE config ADD (path_label VARCHAR2(255) DEFAULT '' NOT NULL)",
     "ALTER TABLE config DROP CONSTRAINT uq_config_metric_env",
     "ALTER TABLE config ADD CONSTRAINT uq_config_path UNIQUE (metric_type, environment, hostname, path_label)",
-    # seed sensible defaults
-    """
-    INSERT INTO config (metric_type, environment, warning_threshold, critical_threshold)
-    SELECT * FROM (
-        SELECT 'DISK_USAGE',            'DEV',  70, 90 FROM DUAL UNION ALL
-        SELECT 'DISK_USAGE',            'UAT',  70, 85 FROM DUAL UNION ALL
-        SELECT 'DISK_USAGE',            'PROD', 75, 90 FROM DUAL UNION ALL
-        SELECT 'INODE_USAGE',           'DEV',  70, 90 FROM DUAL UNION ALL
-        SELECT 'INODE_USAGE',           'UAT',  70, 85 FROM DUAL UNION ALL
-        SELECT 'INODE_USAGE',           'PROD', 75, 90 FROM DUAL UNION ALL
-        SELECT 'MEMORY_USAGE',          'DEV',  75, 90 FROM DUAL UNION ALL
-        SELECT 'MEMORY_USAGE',          'UAT',  75, 90 FROM DUAL UNION ALL
-        SELECT 'MEMORY_USAGE',          'PROD', 80, 95 FROM DUAL UNION ALL
-        SELECT 'CPU_LOAD',              'DEV',  70, 90 FROM DUAL UNION ALL
-        SELECT 'CPU_LOAD',              'UAT',  70, 90 FROM DUAL UNION ALL
-        SELECT 'CPU_LOAD',              'PROD', 75, 95 FROM DUAL UNION ALL
-        SELECT 'TABLESPACE_USAGE',      'DEV',  75, 90 FROM DUAL UNION ALL
-        SELECT 'TABLESPACE_USAGE',      'UAT',  75, 90 FROM DUAL UNION ALL
-        SELECT 'TABLESPACE_USAGE',      'PROD', 80, 95 FROM DUAL UNION ALL
-        SELECT 'BLOCKING_SESSIONS',     'DEV',   5, 20 FROM DUAL UNION ALL
-        SELECT 'BLOCKING_SESSIONS',     'UAT',   5, 20 FROM DUAL UNION ALL
-        SELECT 'BLOCKING_SESSIONS',     'PROD',  2, 10 FROM DUAL UNION ALL
-        SELECT 'LONG_RUNNING_QUERIES',  'DEV',  30, 120 FROM DUAL UNION ALL
-        SELECT 'LONG_RUNNING_QUERIES',  'UAT',  30, 120 FROM DUAL UNION ALL
-        SELECT 'LONG_RUNNING_QUERIES',  'PROD', 15,  60 FROM DUAL
-    )
-    """,
+    # NOVALIDATE: enforce on new writes without failing on legacy rows.
+    # ORA-02264 (name already used) is ignored on re-run.
+    "ALTER TABLE config ADD CONSTRAINT chk_config_thresholds "
+    "CHECK (warning_threshold < critical_threshold) ENABLE NOVALIDATE",
+]
+
+
+# ---------------------------------------------------------------------------
+# Default thresholds — seeded into config by the schema bootstrap
+# ---------------------------------------------------------------------------
+
+# (metric_type, environment, warning_threshold, critical_threshold)
+DEFAULT_THRESHOLDS: list[tuple[str, str, int, int]] = [
+    ("DISK_USAGE",           "DEV",  70,  90),
+    ("DISK_USAGE",           "UAT",  70,  85),
+    ("DISK_USAGE",           "PROD", 75,  90),
+    ("INODE_USAGE",          "DEV",  70,  90),
+    ("INODE_USAGE",          "UAT",  70,  85),
+    ("INODE_USAGE",          "PROD", 75,  90),
+    ("MEMORY_USAGE",         "DEV",  75,  90),
+    ("MEMORY_USAGE",         "UAT",  75,  90),
+    ("MEMORY_USAGE",         "PROD", 80,  95),
+    ("CPU_LOAD",             "DEV",  70,  90),
+    ("CPU_LOAD",             "UAT",  70,  90),
+    ("CPU_LOAD",             "PROD", 75,  95),
+    ("TABLESPACE_USAGE",     "DEV",  75,  90),
+    ("TABLESPACE_USAGE",     "UAT",  75,  90),
+    ("TABLESPACE_USAGE",     "PROD", 80,  95),
+    ("BLOCKING_SESSIONS",    "DEV",   5,  20),
+    ("BLOCKING_SESSIONS",    "UAT",   5,  20),
+    ("BLOCKING_SESSIONS",    "PROD",  2,  10),
+    ("LONG_RUNNING_QUERIES", "DEV",  30, 120),
+    ("LONG_RUNNING_QUERIES", "UAT",  30, 120),
+    ("LONG_RUNNING_QUERIES", "PROD", 15,  60),
 ]
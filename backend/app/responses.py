@@ -0,0 +1,17 @@
+"""
+responses.py — Shared response helpers for the route modules.
+
+The read endpoints hand FastAPI pre-encoded JSON (from a pydantic
+TypeAdapter or orjson), so it neither re-validates nor re-serialises the
+payload; ``response_model`` stays on the decorators for the OpenAPI schema
+only.
+"""
+
+from __future__ import annotations
+
+from fastapi import Response
+
+
+def json_response(body: bytes) -> Response:
+    """Wrap an already-encoded JSON body in a Response."""
+    return Response(body, media_type="application/json")
@@ -3,37 +3,119 @@ routes/alerts.py — Alert listing, acknowledgement and resolution.
 """
 
 import logging
-from datetime import datetime
-from typing import Optional
+from typing import Literal, Optional
 
 import oracledb
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 
-from app.database import get_db
-from app.models import AlertAcknowledge, AlertResponse, AlertStatus
+from app.database import get_cursor
+from app.models import AlertAcknowledge, AlertResponse, AlertStatus, MetricType, Severity
+from app.responses import json_response
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/alerts", tags=["Alerts"])
+router = APIRouter(prefix="/alerts", tags=["Alerts"], default_response_class=ORJSONResponse)
+
+# Serialisers built once at import.  Endpoints return pre-encoded JSON, so
+# FastAPI neither re-validates nor re-serialises the response; response_model
+# is kept on the decorators for the OpenAPI schema only.
+_ALERT_ADAPTER = TypeAdapter(AlertResponse)
+_ALERT_LIST_ADAPTER = TypeAdapter(list[AlertResponse])
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _row_to_alert(row) -> dict:
-    return {
-        "id": row[0],
-        "server_id": row[1],
-        "metric": row[2],
-        "severity": row[3],
-        "label": row[4],
-        "value": float(row[5]) if row[5] is not None else 0.0,
-        "message": row[6],
-        "status": row[7],
-        "acknowledged_by": row[8],
-        "created_at": row[9],
-        "resolved_at": row[10],
-    }
+def _row_to_alert(row) -> AlertResponse:
+    """
+    Build an AlertResponse from a DB row without re-running validation —
+    the row already satisfies the table's types and CHECK constraints.
+    Enum columns are still converted so serialisation sees the declared types.
+    """
+    return AlertResponse.model_construct(
+        id=row[0],
+        server_id=row[1],
+        metric=MetricType(row[2]),
+        severity=Severity(row[3]),
+        label=row[4],
+        value=float(row[5]) if row[5] is not None else 0.0,
+        message=row[6],
+        status=AlertStatus(row[7]),
+        acknowledged_by=row[8],
+        created_at=row[9],
+        resolved_at=row[10],
+    )
+
+
+# State transitions update the row and read it back in one round-trip.
+_RETURNING_ALERT = """
+        RETURNING id, server_id, metric, severity, label, value, message,
+                  status, acknowledged_by, created_at, resolved_at
+        INTO      :r0, :r1, :r2, :r3, :r4, :r5, :r6, :r7, :r8, :r9, :r10
+"""
+_ALERT_OUT_TYPES = (
+    int, int, str, str, str, float, str, str, str,
+    oracledb.DB_TYPE_TIMESTAMP, oracledb.DB_TYPE_TIMESTAMP,
+)
+
+
+def _alert_out_binds(cursor: oracledb.Cursor) -> dict:
+    """OUT variables :r0 … :r10 for ``_RETURNING_ALERT``."""
+    return {f"r{i}": cursor.var(typ) for i, typ in enumerate(_ALERT_OUT_TYPES)}
+
+
+def _returned_alert(out: dict) -> AlertResponse:
+    """
+    Build the response from the OUT variables of a single-row UPDATE, so the
+    handler needs no follow-up SELECT.  ``out`` is in :r0 … :r10 order.
+    """
+    return _row_to_alert([var.getvalue()[0] for var in out.values()])
+
+
+# list_alerts SQL text per filter combination (at most 16).  Reusing the
+# identical string lets the driver's statement cache and Oracle's shared pool
+# serve every request after the first for a given combination.
+_LIST_SQL_CACHE: dict[tuple[bool, bool, bool, bool], str] = {}
+
+
+def _build_list_sql(by_status: bool, by_server: bool, by_severity: bool, by_env: bool) -> str:
+    """SQL for list_alerts; servers is only joined when filtering by environment."""
+    sql = """
+        SELECT a.id, a.server_id, a.metric, a.severity, a.label,
+               a.value, a.message, a.status, a.acknowledged_by,
+               a.created_at, a.resolved_at
+        FROM   alerts a"""
+    if by_env:
+        sql += "\n        JOIN   servers s ON s.id = a.server_id"
+    sql += "\n        WHERE  1=1"
+    if by_status:
+        sql += " AND a.status = :status"
+    if by_server:
+        sql += " AND a.server_id = :sid"
+    if by_severity:
+        sql += " AND a.severity = :sev"
+    if by_env:
+        sql += " AND s.environment = :env"
+    return sql + " ORDER BY a.created_at DESC FETCH FIRST :lim ROWS ONLY"
+
+
+# Query-parameter filters are plain string literals: validated by membership
+# and bound to SQL as-is, without building an enum member per request.  The
+# Enum classes stay on the response models.
+StatusFilter = Literal["OPEN", "ACKNOWLEDGED", "RESOLVED"]
+SeverityFilter = Literal["WARNING", "CRITICAL"]
+EnvironmentFilter = Literal["DEV", "UAT", "PROD"]
+
+
+def _current_status(cursor: oracledb.Cursor, alert_id: int) -> str:
+    """Return the alert's status, or raise 404 if it does not exist."""
+    cursor.execute("SELECT status FROM alerts WHERE id = :aid", {"aid": alert_id})
+    row = cursor.fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
+    return row[0]
 
 
 # ---------------------------------------------------------------------------
@@ -42,54 +124,41 @@ def _row_to_alert(row) -> dict:
 
 @router.get("/", response_model=list[AlertResponse])
 def list_alerts(
-    status: Optional[AlertStatus] = Query(None, description="Filter by alert status"),
+    status: Optional[StatusFilter] = Query(None, description="Filter by alert status"),
     server_id: Optional[int] = Query(None, description="Filter by server"),
-    severity: Optional[str] = Query(None, description="Filter by severity: WARNING|CRITICAL"),
-    environment: Optional[str] = Query(None, description="Filter by environment: DEV|UAT|PROD"),
+    severity: Optional[SeverityFilter] = Query(None, description="Filter by severity"),
+    environment: Optional[EnvironmentFilter] = Query(None, description="Filter by environment"),
     limit: int = Query(200, ge=1, le=1000),
-    con: oracledb.Connection = Depends(get_db),
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """
     Retrieve alerts with optional filters.
     """
-    sql = """
-        SELECT a.id, a.server_id, a.metric, a.severity, a.label,
-               a.value, a.message, a.status, a.acknowledged_by,
-               a.created_at, a.resolved_at
-        FROM   alerts a
-        JOIN   servers s ON s.id = a.server_id
-        WHERE  1=1
-    """
-    params: dict = {}
-
+    flags = (bool(status), server_id is not None, bool(severity), bool(environment))
+    params: dict = {"lim": limit}
     if status:
-        sql += " AND a.status = :status"
-        params["status"] = status.value
-
+        params["status"] = status
     if server_id is not None:
-        sql += " AND a.server_id = :sid"
         params["sid"] = server_id
-
     if severity:
-        sql += " AND a.severity = :sev"
-        params["sev"] = severity.upper()
-
+        params["sev"] = severity
     if environment:
-        sql += " AND s.environment = :env"
-        params["env"] = environment.upper()
+        params["env"] = environment
 
-    sql += " ORDER BY a.created_at DESC FETCH FIRST :lim ROWS ONLY"
-    params["lim"] = limit
+    sql = _LIST_SQL_CACHE.get(flags)
+    if sql is None:
+        sql = _LIST_SQL_CACHE[flags] = _build_list_sql(*flags)
 
-    cursor = con.cursor()
+    # Size the fetch buffer to the page so the rows arrive in one round-trip.
+    cursor.arraysize = limit
+    cursor.prefetchrows = limit + 1
     cursor.execute(sql, params)
-    return [_row_to_alert(r) for r in cursor.fetchall()]
+    return json_response(_ALERT_LIST_ADAPTER.dump_json([_row_to_alert(r) for r in cursor]))
 
 
 @router.get("/{alert_id}", response_model=AlertResponse)
-def get_alert(alert_id: int, con: oracledb.Connection = Depends(get_db)):
+def get_alert(alert_id: int, cursor: oracledb.Cursor = Depends(get_cursor, scope="function")):
     """Return a single alert by ID."""
-    cursor = con.cursor()
     cursor.execute(
         """
         SELECT id, server_id, metric, severity, label, value, message,
@@ -102,77 +171,79 @@ def get_alert(alert_id: int, con: oracledb.Connection = Depends(get_db)):
     row = cursor.fetchone()
     if not row:
         raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
-    return _row_to_alert(row)
+    return json_response(_ALERT_ADAPTER.dump_json(_row_to_alert(row)))
 
 
 @router.post("/acknowledge", response_model=AlertResponse)
 def acknowledge_alert(
     payload: AlertAcknowledge,
-    con: oracledb.Connection = Depends(get_db),
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """
     Acknowledge an open alert.
     Transitions status: OPEN → ACKNOWLEDGED.
     """
-    cursor = con.cursor()
-    cursor.execute(
-        "SELECT status FROM alerts WHERE id = :aid",
-        {"aid": payload.alert_id},
-    )
-    row = cursor.fetchone()
-    if not row:
-        raise HTTPException(status_code=404, detail=f"Alert {payload.alert_id} not found")
-    if row[0] != AlertStatus.OPEN.value:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Alert is already {row[0]}. Only OPEN alerts can be acknowledged.",
-        )
-
+    out = _alert_out_binds(cursor)
     cursor.execute(
         """
         UPDATE alerts
         SET    status = 'ACKNOWLEDGED',
                acknowledged_by = :by
-        WHERE  id = :aid
-        """,
-        {"by": payload.acknowledged_by, "aid": payload.alert_id},
+        WHERE  id = :aid AND status = 'OPEN'
+        """ + _RETURNING_ALERT,
+        {"by": payload.acknowledged_by, "aid": payload.alert_id, **out},
     )
+    if cursor.rowcount == 0:
+        status = _current_status(cursor, payload.alert_id)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Alert is already {status}. Only OPEN alerts can be acknowledged.",
+        )
     logger.info("Alert %d acknowledged by %s", payload.alert_id, payload.acknowledged_by)
-    return get_alert(payload.alert_id, con)
+    return json_response(_ALERT_ADAPTER.dump_json(_returned_alert(out)))
 
 
 @router.post("/{alert_id}/resolve", response_model=AlertResponse)
-def resolve_alert(alert_id: int, con: oracledb.Connection = Depends(get_db)):
+def resolve_alert(alert_id: int, cursor: oracledb.Cursor = Depends(get_cursor, scope="function")):
     """
     Manually resolve an alert.
     Transitions status: OPEN|ACKNOWLEDGED → RESOLVED.
     """
-    cursor = con.cursor()
-    cursor.execute("SELECT status FROM alerts WHERE id = :aid", {"aid": alert_id})
-    row = cursor.fetchone()
-    if not row:
-        raise HTTPException(status_code=404, detail=f"Alert {alert_id} not found")
-    if row[0] == AlertStatus.RESOLVED.value:
-        raise HTTPException(status_code=400, detail="Alert is already resolved.")
-
+    out = _alert_out_binds(cursor)
     cursor.execute(
         """
         UPDATE alerts
         SET    status = 'RESOLVED',
-               resolved_at = :now
-        WHERE  id = :aid
-        """,
-        {"now": datetime.utcnow(), "aid": alert_id},
+               resolved_at = SYS_EXTRACT_UTC(SYSTIMESTAMP)
+        WHERE  id = :aid AND status IN ('OPEN', 'ACKNOWLEDGED')
+        """ + _RETURNING_ALERT,
+        {"aid": alert_id, **out},
     )
+    if cursor.rowcount == 0:
+        _current_status(cursor, alert_id)
+        raise HTTPException(status_code=400, detail="Alert is already resolved.")
     logger.info("Alert %d resolved.", alert_id)
-    return get_alert(alert_id, con)
+    return json_response(_ALERT_ADAPTER.dump_json(_returned_alert(out)))
 
 
 @router.get("/summary/counts")
-def alert_summary(con: oracledb.Connection = Depends(get_db)):
+def alert_summary(cursor: oracledb.Cursor = Depends(get_cursor, scope="function")):
     """
     Return alert counts grouped by environment, severity and status.
     Used by the Dashboard header stats.
+
+    ``counts`` is the nested ``env -> severity -> status -> count`` map;
+    the roll-ups are kept apart in ``totals`` so they never collide with an
+    environment, severity or status key::
+
+        {
+            "counts": {"PROD": {"CRITICAL": {"OPEN": 2, "RESOLVED": 1}}},
+            "totals": {
+                "all": 3,
+                "by_env": {"PROD": 3},
+                "by_env_severity": {"PROD": {"CRITICAL": 3}},
+            },
+        }
     """
     sql = """
         SELECT s.environment, a.severity, a.status, COUNT(*) AS cnt
@@ -181,9 +252,23 @@ def alert_summary(con: oracledb.Connection = Depends(get_db)):
         GROUP BY s.environment, a.severity, a.status
         ORDER BY s.environment, a.severity
     """
-    cursor = con.cursor()
+    # At most 3 environments x 2 severities x 3 statuses = 18 groups.
+    cursor.arraysize = 20
+    cursor.prefetchrows = 21
     cursor.execute(sql)
-    result: dict = {}
-    for env, sev, status, cnt in cursor.fetchall():
-        result.setdefault(env, {}).setdefault(sev, {})[status] = cnt
-    return result
+    # Roll-ups are accumulated in the same pass over the base groups (SQLite,
+    # used in dev, has no GROUPING SETS).
+    counts: dict[str, dict[str, dict[str, int]]] = {}
+    by_env: dict[str, int] = {}
+    by_env_severity: dict[str, dict[str, int]] = {}
+    total = 0
+    for env, sev, status, cnt in cursor:
+        counts.setdefault(env, {}).setdefault(sev, {})[status] = cnt
+        env_severity = by_env_severity.setdefault(env, {})
+        env_severity[sev] = env_severity.get(sev, 0) + cnt
+        by_env[env] = by_env.get(env, 0) + cnt
+        total += cnt
+    return {
+        "counts": counts,
+        "totals": {"all": total, "by_env": by_env, "by_env_severity": by_env_severity},
+    }
@@ -3,32 +3,144 @@ routes/config.py — Threshold configuration endpoints.
 """
 
 import logging
+import sqlite3
 from typing import Optional
 
 import oracledb
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 
-from app.database import get_db
-from app.models import Environment, MetricType, ThresholdConfig, ThresholdConfigResponse
+from app.database import DB_TYPE, get_cursor
+from app.models import (
+    ENV_VALUES,
+    METRIC_VALUES,
+    Environment,
+    MetricType,
+    ThresholdConfig,
+    ThresholdConfigResponse,
+)
+from app.responses import json_response
+from app.services.cache import MISSING, TTLCache
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/config", tags=["Config"])
+router = APIRouter(prefix="/config", tags=["Config"], default_response_class=ORJSONResponse)
+
+# Serialisers built once at import; see routes/alerts.py.
+_CONFIG_ADAPTER = TypeAdapter(ThresholdConfigResponse)
+_CONFIG_LIST_ADAPTER = TypeAdapter(list[ThresholdConfigResponse])
 
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _row_to_config(row) -> dict:
-    return {
-        "id": row[0],
-        "metric_type": row[1],
-        "environment": row[2],
-        "hostname": row[3],
-        "path_label": row[4],
-        "warning_threshold": float(row[5]),
-        "critical_threshold": float(row[6]),
-    }
+def _row_to_config(row) -> ThresholdConfigResponse:
+    """Build a ThresholdConfigResponse from a DB row, skipping re-validation."""
+    return ThresholdConfigResponse.model_construct(
+        id=row[0],
+        metric_type=MetricType(row[1]),
+        environment=Environment(row[2]),
+        hostname=row[3],
+        path_label=row[4],
+        warning_threshold=float(row[5]),
+        critical_threshold=float(row[6]),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Upsert SQL (single round-trip, no check-then-write race)
+# ---------------------------------------------------------------------------
+
+# Oracle: MERGE has no RETURNING clause, so the id is read back inside the
+# same anonymous block.
+_MERGE_SQL = """
+BEGIN
+    MERGE INTO config c
+    USING (SELECT :mt AS metric_type, :env AS environment,
+                  :hn AS hostname, :lbl AS path_label FROM DUAL) src
+    ON (    c.metric_type = src.metric_type AND c.environment = src.environment
+        AND c.hostname    = src.hostname    AND c.path_label  = src.path_label)
+    WHEN MATCHED THEN UPDATE
+        SET c.warning_threshold = :warn, c.critical_threshold = :crit
+    WHEN NOT MATCHED THEN INSERT
+        (metric_type, environment, hostname, path_label, warning_threshold, critical_threshold)
+        VALUES (:mt, :env, :hn, :lbl, :warn, :crit);
+    SELECT id INTO :out_id FROM config
+    WHERE  metric_type = :mt AND environment = :env
+      AND  hostname = :hn AND path_label = :lbl;
+END;
+"""
+
+# SQLite (dev): native upsert; the adapter maps RETURNING ... INTO onto the
+# out_id bind.
+_SQLITE_UPSERT_SQL = """
+INSERT INTO config
+    (metric_type, environment, hostname, path_label, warning_threshold, critical_threshold)
+VALUES (:mt, :env, :hn, :lbl, :warn, :crit)
+ON CONFLICT (metric_type, environment, hostname, path_label) DO UPDATE
+    SET warning_threshold  = excluded.warning_threshold,
+        critical_threshold = excluded.critical_threshold
+RETURNING id INTO :out_id
+"""
+
+_UPSERT_SQL = _MERGE_SQL if DB_TYPE == "oracle" else _SQLITE_UPSERT_SQL
+
+
+# ---------------------------------------------------------------------------
+# Threshold lookup cache
+# ---------------------------------------------------------------------------
+
+# (metric_type, environment, hostname, path_label) -> config or None.  The
+# config table is tiny and rarely written, so lookups are served from memory;
+# misses are cached briefly so repeated 404s stay cheap too.  The cache is per
+# worker process and cleared on every write through this API.
+_CONFIG_TTL_SECONDS = 60.0
+_CONFIG_MISS_TTL_SECONDS = 5.0
+_config_cache = TTLCache(ttl=_CONFIG_TTL_SECONDS)
+
+# Rows per fetch round-trip for list_configs: the global defaults plus any
+# per-host/per-path overrides comfortably fit in one trip.
+_CONFIG_FETCH_ARRAYSIZE = 500
+
+
+def _fetch_config(
+    cursor: oracledb.Cursor, mt: str, env: str, hn: str, lbl: str
+) -> Optional[ThresholdConfigResponse]:
+    """Return the config row for the key (cached), or None if it does not exist."""
+    key = (mt, env, hn, lbl)
+    hit = _config_cache.get(key)
+    if hit is not MISSING:
+        return hit
+
+    generation = _config_cache.generation(key)
+    cursor.execute(
+        "SELECT id, metric_type, environment, hostname, path_label, "
+        "warning_threshold, critical_threshold "
+        "FROM config WHERE metric_type = :mt AND environment = :env "
+        "AND hostname = :hn AND path_label = :lbl",
+        {"mt": mt, "env": env, "hn": hn, "lbl": lbl},
+    )
+    row = cursor.fetchone()
+    cfg = _row_to_config(row) if row else None
+    ttl = _CONFIG_TTL_SECONDS if cfg is not None else _CONFIG_MISS_TTL_SECONDS
+    _config_cache.set(key, cfg, ttl=ttl, generation=generation)
+    return cfg
+
+
+def _commit_and_invalidate(cursor: oracledb.Cursor) -> None:
+    """
+    Commit the request's config write, then clear this worker's cache.
+
+    Committing first (rather than leaving it to get_db's teardown) means a
+    concurrent lookup can no longer re-cache the pre-write row from a read
+    that lands between the two; one that read before the commit is dropped
+    by the cache's generation check.  Other worker processes are not
+    notified and keep serving their cached entries until the TTL expires
+    (at most ``_CONFIG_TTL_SECONDS``).
+    """
+    cursor.connection.commit()
+    _config_cache.clear()
 
 
 # ---------------------------------------------------------------------------
@@ -41,10 +153,9 @@ def list_configs(
         None,
         description="Filter by hostname; pass empty string '' to retrieve only global env-level defaults",
     ),
-    con: oracledb.Connection = Depends(get_db),
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """Return all threshold configurations, optionally filtered by hostname."""
-    cursor = con.cursor()
     sql = (
         "SELECT id, metric_type, environment, hostname, path_label, "
         "warning_threshold, critical_threshold FROM config WHERE 1=1"
@@ -54,8 +165,10 @@ def list_configs(
         sql += " AND hostname = :hn"
         params["hn"] = hostname
     sql += " ORDER BY environment, metric_type, hostname, path_label"
+    cursor.arraysize = _CONFIG_FETCH_ARRAYSIZE
+    cursor.prefetchrows = _CONFIG_FETCH_ARRAYSIZE + 1
     cursor.execute(sql, params)
-    return [_row_to_config(r) for r in cursor.fetchall()]
+    return json_response(_CONFIG_LIST_ADAPTER.dump_json([_row_to_config(r) for r in cursor]))
 
 
 @router.get("/{metric_type}/{environment}", response_model=ThresholdConfigResponse)
@@ -64,19 +177,13 @@ def get_config(
     environment: Environment,
     hostname: str = Query('', description="Specific server hostname; empty for global"),
     path_label: str = Query('', description="Specific path/label; empty for all"),
-    con: oracledb.Connection = Depends(get_db),
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """Return a specific threshold config by metric, environment, and optional hostname/path."""
-    cursor = con.cursor()
-    cursor.execute(
-        "SELECT id, metric_type, environment, hostname, path_label, "
-        "warning_threshold, critical_threshold "
-        "FROM config WHERE metric_type = :mt AND environment = :env "
-        "AND hostname = :hn AND path_label = :lbl",
-        {"mt": metric_type.value, "env": environment.value, "hn": hostname, "lbl": path_label},
+    cfg = _fetch_config(
+        cursor, METRIC_VALUES[metric_type], ENV_VALUES[environment], hostname, path_label
     )
-    row = cursor.fetchone()
-    if not row:
+    if cfg is None:
         raise HTTPException(
             status_code=404,
             detail=(
@@ -85,101 +192,72 @@ def get_config(
                 + (f" path='{path_label}'" if path_label else "")
             ),
         )
-    return _row_to_config(row)
+    return json_response(_CONFIG_ADAPTER.dump_json(cfg))
 
 
 @router.post("/update", response_model=ThresholdConfigResponse)
 def update_config(
     payload: ThresholdConfig,
-    con: oracledb.Connection = Depends(get_db),
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """
     Create or update a threshold configuration for a metric/environment pair.
 
     Rules:
-    - ``warning_threshold`` must be less than ``critical_threshold``.
+    - ``warning_threshold`` must be less than ``critical_threshold``
+      (enforced by the ``chk_config_thresholds`` CHECK constraint).
+    - The change is visible to this worker's lookups immediately; other
+      worker processes may serve the old row until their cached entry
+      expires (up to ``_CONFIG_TTL_SECONDS``).
     """
-    if payload.warning_threshold >= payload.critical_threshold:
-        raise HTTPException(
-            status_code=422,
-            detail="warning_threshold must be strictly less than critical_threshold.",
-        )
-
-    cursor = con.cursor()
-
-    # Check if record exists
-    cursor.execute(
-        "SELECT id FROM config WHERE metric_type = :mt AND environment = :env "
-        "AND hostname = :hn AND path_label = :lbl",
-        {
-            "mt": payload.metric_type.value,
-            "env": payload.environment.value,
-            "hn": payload.hostname,
-            "lbl": payload.path_label,
-        },
-    )
-    row = cursor.fetchone()
-
-    if row:
-        cursor.execute(
-            """
-            UPDATE config
-            SET    warning_threshold  = :warn,
-                   critical_threshold = :crit
-            WHERE  metric_type = :mt AND environment = :env
-              AND  hostname = :hn AND path_label = :lbl
-            """,
-            {
-                "warn": payload.warning_threshold,
-                "crit": payload.critical_threshold,
-                "mt": payload.metric_type.value,
-                "env": payload.environment.value,
-                "hn": payload.hostname,
-                "lbl": payload.path_label,
-            },
-        )
-    else:
+    out_id = cursor.var(int)
+    try:
         cursor.execute(
-            """
-            INSERT INTO config
-                (metric_type, environment, hostname, path_label,
-                 warning_threshold, critical_threshold)
-            VALUES (:mt, :env, :hn, :lbl, :warn, :crit)
-            """,
+            _UPSERT_SQL,
             {
-                "mt": payload.metric_type.value,
-                "env": payload.environment.value,
+                "mt": METRIC_VALUES[payload.metric_type],
+                "env": ENV_VALUES[payload.environment],
                 "hn": payload.hostname,
                 "lbl": payload.path_label,
                 "warn": payload.warning_threshold,
                 "crit": payload.critical_threshold,
+                "out_id": out_id,
             },
         )
+    except (oracledb.IntegrityError, sqlite3.IntegrityError) as exc:
+        if "CHK_CONFIG_THRESHOLDS" not in str(exc).upper():
+            raise
+        raise HTTPException(
+            status_code=422,
+            detail="warning_threshold must be strictly less than critical_threshold.",
+        )
+    val = out_id.getvalue()
+    config_id = int(val[0] if isinstance(val, list) else val)
 
-    logger.info(
-        "Config updated: %s/%s hostname=%s path=%s warn=%.1f crit=%.1f",
-        payload.metric_type.value,
-        payload.environment.value,
-        payload.hostname or "(global)",
-        payload.path_label or "(all)",
-        payload.warning_threshold,
-        payload.critical_threshold,
-    )
-    return get_config(
-        payload.metric_type, payload.environment,
-        payload.hostname, payload.path_label, con,
-    )
+    _commit_and_invalidate(cursor)
+    if logger.isEnabledFor(logging.INFO):  # skip building the args when filtered
+        logger.info(
+            "Config updated: %s/%s hostname=%s path=%s warn=%.1f crit=%.1f",
+            payload.metric_type.value,
+            payload.environment.value,
+            payload.hostname or "(global)",
+            payload.path_label or "(all)",
+            payload.warning_threshold,
+            payload.critical_threshold,
+        )
+    cfg = ThresholdConfigResponse.model_construct(id=config_id, **dict(payload))
+    return json_response(_CONFIG_ADAPTER.dump_json(cfg))
 
 
 @router.delete("/{config_id}", status_code=204)
-def delete_config(config_id: int, con: oracledb.Connection = Depends(get_db)):
+def delete_config(config_id: int, cursor: oracledb.Cursor = Depends(get_cursor, scope="function")):
     """
     Delete a threshold override by its numeric ID.
     Use this to remove server/path-specific overrides (global env defaults should be edited, not deleted).
     """
-    cursor = con.cursor()
     cursor.execute("SELECT id FROM config WHERE id = :cid", {"cid": config_id})
     if not cursor.fetchone():
         raise HTTPException(status_code=404, detail=f"Config {config_id} not found")
     cursor.execute("DELETE FROM config WHERE id = :cid", {"cid": config_id})
+    _commit_and_invalidate(cursor)
     logger.info("Config %d deleted", config_id)
@@ -5,45 +5,78 @@ Agents POST payloads here; frontend GETs historical data for charts.
 """
 
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Optional
 
 import oracledb
-from fastapi import APIRouter, Depends, HTTPException, Query
+import orjson
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
 
-from app.database import get_db
-from app.models import MetricPayload, MetricResponse, MetricType
+from app.database import DB_TYPE, DatabaseUnavailable, get_connection, get_cursor
+from app.models import ENV_VALUES, METRIC_VALUES, MetricPayload, MetricResponse, MetricType
+from app.responses import json_response
 from app.services.alert_engine import AlertEngine
+from app.services.cache import MISSING, TTLCache
+from app.telemetry import query_timer
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/metrics", tags=["Metrics"])
 
+# Read-side caches for the dashboard trend charts and status cards, which
+# poll with the same parameters every few seconds.  Keys start with the
+# server_id (None for "all servers"); ingest drops that server's entries.
+# Values are the encoded JSON bodies.  Past its TTL an entry is still served
+# for stale_ttl seconds while one request refreshes it after responding, so
+# expiry does not send every open dashboard tab to the database at once.
+_history_cache = TTLCache(ttl=15.0, stale_ttl=15.0)
+_latest_cache = TTLCache(ttl=10.0, stale_ttl=10.0)
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _row_to_metric(row) -> dict:
+# The read endpoints return DB rows as-is, which already match
+# MetricResponse, so they are encoded with orjson directly instead of being
+# validated and serialised row by row.
+def _row_to_metric(id, server_id, metric_type, value, label, timestamp, *_) -> dict:
+    """cursor.rowfactory for metric rows (trailing extra columns are ignored)."""
     return {
-        "id": row[0],
-        "server_id": row[1],
-        "metric_type": row[2],
-        "value": float(row[3]),
-        "label": row[4],
-        "timestamp": row[5],
+        "id": id,
+        "server_id": server_id,
+        "metric_type": metric_type,
+        "value": float(value),
+        "label": label,
+        "timestamp": timestamp,
     }
 
 
+# hostname -> servers.id.  Server rows are never deleted or renamed, so a
+# mapping, once seen committed, stays valid for the life of the process.
+_server_ids: dict[str, int] = {}
+_server_ids_lock = threading.Lock()
+
+
 def _get_or_create_server(cursor: oracledb.Cursor, hostname: str, env: str, stype: str) -> int:
     """Return existing server ID or insert a new record."""
+    server_id = _server_ids.get(hostname)
+    if server_id is not None:
+        return server_id
+
     cursor.execute(
         "SELECT id FROM servers WHERE hostname = :hn",
         {"hn": hostname},
     )
     row = cursor.fetchone()
     if row:
-        return int(row[0])
+        with _server_ids_lock:
+            server_id = _server_ids[hostname] = int(row[0])
+        return server_id
 
+    # A freshly inserted id is not cached: the request's transaction could
+    # still roll back.  The next ingest from this host picks it up via the
+    # SELECT above.
     new_id_var = cursor.var(int)
     cursor.execute(
         """
@@ -61,87 +94,141 @@ def _get_or_create_server(cursor: oracledb.Cursor, hostname: str, env: str, styp
 # Ingest endpoint (used by agents)
 # ---------------------------------------------------------------------------
 
-@router.post("/ingest", status_code=201)
+_INSERT_METRIC_SQL = """
+    INSERT INTO metrics (server_id, metric_type, value, label, timestamp)
+    VALUES (:sid, :mtype, :val, :lbl, :ts)
+"""
+
+# Upper bound on rows per executemany call; keeps the bind arrays of an
+# unusually large payload well inside the driver's limits.
+_INSERT_CHUNK_ROWS = 10_000
+
+@router.post("/ingest", status_code=204, response_class=Response)
 def ingest_metrics(
     payload: MetricPayload,
-    con: oracledb.Connection = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """
     Accept a batch of metrics from a Unix or Oracle agent.
 
     - Auto-registers the server if it is not yet known.
-    - Persists every metric to the ``metrics`` table.
-    - Runs the alert engine for each metric.
+    - Persists every metric to the ``metrics`` table and commits.
+    - Schedules the alert engine over the whole batch to run after the
+      response has been sent (see :func:`_evaluate_alerts`).
 
-    Returns a summary of how many metrics were stored and alerts generated.
+    Responds ``204 No Content``; the summary travels in the
+    ``X-Server-Id`` and ``X-Metrics-Stored`` headers so neither side has to
+    encode or parse a JSON body.
     """
-    cursor = con.cursor()
-
     server_id = _get_or_create_server(
         cursor,
         hostname=payload.hostname,
-        env=payload.environment.value,
+        env=ENV_VALUES[payload.environment],
         stype=payload.server_type.value,
     )
 
-    engine = AlertEngine(cursor, server_id, payload.environment.value, payload.hostname)
-    alerts_generated = 0
-    metrics_stored = 0
-
-    for metric in payload.metrics:
-        now = metric.timestamp or datetime.utcnow()
-        cursor.execute(
-            """
-            INSERT INTO metrics (server_id, metric_type, value, label, timestamp)
-            VALUES (:sid, :mtype, :val, :lbl, :ts)
-            """,
-            {
-                "sid": server_id,
-                "mtype": metric.metric_type.value,
-                "val": metric.value,
-                "lbl": metric.label,
-                "ts": now,
-            },
-        )
-        metrics_stored += 1
+    # All rows go to Oracle as one array-bound INSERT (one round-trip per
+    # chunk) rather than one execute per metric.
+    now = datetime.utcnow()
+    rows = [
+        {
+            "sid": server_id,
+            "mtype": METRIC_VALUES[metric.metric_type],
+            "val": metric.value,
+            "lbl": metric.label,
+            "ts": metric.timestamp or now,
+        }
+        for metric in payload.metrics
+    ]
+    with query_timer("metrics_ingest"):
+        for start in range(0, len(rows), _INSERT_CHUNK_ROWS):
+            cursor.executemany(_INSERT_METRIC_SQL, rows[start:start + _INSERT_CHUNK_ROWS])
+    metrics_stored = len(rows)
+    # The request's single commit (get_db's teardown then has nothing left
+    # to commit).  Done here so the background alert pass (own connection)
+    # sees the server row, and the agent is only answered once its data is
+    # durable.
+    cursor.connection.commit()
 
-        # Evaluate alert thresholds
-        alert_created = engine.evaluate(
-            metric_type=metric.metric_type.value,
-            value=metric.value,
-            label=metric.label,
-        )
-        if alert_created:
-            alerts_generated += 1
+    _history_cache.invalidate(lambda key: key[0] in (server_id, None))
+    _latest_cache.invalidate(lambda key: key == server_id)
 
-    logger.info(
-        "Ingested %d metrics from %s; %d alerts generated",
-        metrics_stored,
+    background_tasks.add_task(
+        _evaluate_alerts,
+        server_id,
+        ENV_VALUES[payload.environment],
         payload.hostname,
-        alerts_generated,
+        [(r["mtype"], r["val"], r["lbl"]) for r in rows],
+    )
+    logger.info("Ingested %d metrics from %s", metrics_stored, payload.hostname)
+    return Response(
+        status_code=204,
+        headers={
+            "X-Server-Id": str(server_id),
+            "X-Metrics-Stored": str(metrics_stored),
+        },
     )
-    return {
-        "server_id": server_id,
-        "metrics_stored": metrics_stored,
-        "alerts_generated": alerts_generated,
-    }
+
+
+def _evaluate_alerts(
+    server_id: int, environment: str, hostname: str, readings: list[tuple]
+) -> None:
+    """
+    Background task: run the alert engine for an ingested batch in its own
+    transaction.  The request's connection is back in the pool by now
+    (``get_cursor`` is function-scoped), so this never holds two at once.
+    """
+    try:
+        with get_connection() as con:
+            cursor = con.cursor()
+            try:
+                engine = AlertEngine(cursor, server_id, environment, hostname)
+                alerts_generated = engine.evaluate_batch(readings)
+            finally:
+                cursor.close()
+    except Exception:
+        logger.exception("Alert evaluation failed for %s (server %d)", hostname, server_id)
+        return
+    logger.info("Alert pass for %s: %d alerts generated", hostname, alerts_generated)
 
 
 # ---------------------------------------------------------------------------
 # Query endpoints (used by frontend)
 # ---------------------------------------------------------------------------
 
-@router.get("/", response_model=list[MetricResponse])
-def get_metrics(
-    server_id: Optional[int] = Query(None, description="Filter by server"),
-    metric_type: Optional[MetricType] = Query(None, description="Filter by metric type"),
-    hours: int = Query(24, ge=1, le=720, description="Look-back window in hours"),
-    limit: int = Query(500, ge=1, le=5000),
-    con: oracledb.Connection = Depends(get_db),
-):
-    """
-    Retrieve historical metrics.  Used by the frontend trend charts.
-    """
+# Latest reading per (metric_type, label) for one server, as a single
+# aggregation over idx_metrics_latest rather than ranking every row.
+_ORACLE_LATEST_SQL = """
+    SELECT MAX(id)    KEEP (DENSE_RANK LAST ORDER BY timestamp, id),
+           server_id, metric_type,
+           MAX(value) KEEP (DENSE_RANK LAST ORDER BY timestamp, id),
+           label, MAX(timestamp)
+    FROM   metrics
+    WHERE  server_id = :sid
+    GROUP BY server_id, metric_type, label
+    ORDER BY metric_type
+"""
+
+# SQLite (dev): no KEEP; bare columns next to MAX() are taken from the row
+# holding the maximum (the trailing MAX column is otherwise unused).
+_SQLITE_LATEST_SQL = """
+    SELECT id, server_id, metric_type, value, label, timestamp, MAX(timestamp)
+    FROM   metrics
+    WHERE  server_id = :sid
+    GROUP BY server_id, metric_type, label
+    ORDER BY metric_type
+"""
+
+_LATEST_SQL = _ORACLE_LATEST_SQL if DB_TYPE == "oracle" else _SQLITE_LATEST_SQL
+
+def _query_history(
+    cursor: oracledb.Cursor,
+    server_id: Optional[int],
+    metric_type: Optional[MetricType],
+    hours: int,
+    limit: int,
+) -> bytes:
     since = datetime.utcnow() - timedelta(hours=hours)
     sql = (
         "SELECT id, server_id, metric_type, value, label, timestamp "
@@ -160,33 +247,108 @@ def get_metrics(
     sql += " ORDER BY timestamp DESC FETCH FIRST :lim ROWS ONLY"
     params["lim"] = limit
 
-    cursor = con.cursor()
-    cursor.execute(sql, params)
-    return [_row_to_metric(r) for r in cursor.fetchall()]
+    # Size the fetch buffer to the page so the rows arrive in one round-trip.
+    cursor.arraysize = limit
+    cursor.prefetchrows = limit + 1
+    with query_timer("metrics_history"):
+        cursor.execute(sql, params)
+        cursor.rowfactory = _row_to_metric
+        rows = cursor.fetchall()
+    return orjson.dumps(rows)
+
+
+def _query_latest(cursor: oracledb.Cursor, server_id: int) -> Optional[bytes]:
+    """Encoded latest readings for the server, or None if it has no metrics."""
+    with query_timer("metrics_latest"):
+        cursor.execute(_LATEST_SQL, {"sid": server_id})
+        cursor.rowfactory = _row_to_metric
+        rows = cursor.fetchall()
+    return orjson.dumps(rows) if rows else None
+
+
+def _run_query(query, *args):
+    """Run *query* on a connection of its own (cache misses and refreshes)."""
+    with get_connection() as con, con.cursor() as cursor:
+        return query(cursor, *args)
+
+
+def _query_or_503(query, *args):
+    """:func:`_run_query` for a request; an unreachable database is a 503."""
+    try:
+        return _run_query(query, *args)
+    except DatabaseUnavailable as exc:
+        raise HTTPException(503, f"Database unavailable: {exc}")
+
+
+def _refresh(cache: TTLCache, key, query, *args) -> None:
+    """
+    Background task: re-run *query* on its own connection and re-fill *key*.
+
+    Runs after the request's connection has been released.  The result is
+    stored against the key's generation read before the query, so an ingest
+    that invalidates the key meanwhile wins over this (possibly older) read.
+    """
+    generation = cache.generation(key)
+    try:
+        body = _run_query(query, *args)
+    except Exception:
+        logger.exception("Cache refresh failed for %r", key)
+        cache.release(key)
+        return
+    if body is None:
+        cache.delete(key)
+    else:
+        cache.set(key, body, generation=generation)
+
+
+@router.get("/", response_model=list[MetricResponse])
+def get_metrics(
+    background_tasks: BackgroundTasks,
+    server_id: Optional[int] = Query(None, description="Filter by server"),
+    metric_type: Optional[MetricType] = Query(None, description="Filter by metric type"),
+    hours: int = Query(24, ge=1, le=720, description="Look-back window in hours"),
+    limit: int = Query(500, ge=1, le=5000),
+):
+    """
+    Retrieve historical metrics.  Used by the frontend trend charts.
+
+    Cache hits are answered without touching the connection pool; a
+    connection is only acquired on a miss.
+    """
+    key = (server_id, metric_type, hours, limit)
+    hit, refresh = _history_cache.get_stale(key)
+    if refresh:
+        background_tasks.add_task(
+            _refresh, _history_cache, key, _query_history, server_id, metric_type, hours, limit
+        )
+    if hit is not MISSING:
+        return json_response(hit)
+
+    generation = _history_cache.generation(key)
+    body = _query_or_503(_query_history, server_id, metric_type, hours, limit)
+    _history_cache.set(key, body, generation=generation)
+    return json_response(body)
 
 
 @router.get("/latest", response_model=list[MetricResponse])
 def get_latest_metrics(
+    background_tasks: BackgroundTasks,
     server_id: int = Query(..., description="Server ID"),
-    con: oracledb.Connection = Depends(get_db),
 ):
     """
     Return the single most-recent reading for every metric type on a server.
-    Used by the dashboard "current status" cards.
-    """
-    sql = """
-        SELECT id, server_id, metric_type, value, label, timestamp
-        FROM (
-            SELECT id, server_id, metric_type, value, label, timestamp,
-                   ROW_NUMBER() OVER (PARTITION BY metric_type, label ORDER BY timestamp DESC) AS rn
-            FROM   metrics
-            WHERE  server_id = :sid
-        ) WHERE rn = 1
-        ORDER BY metric_type
+    Used by the dashboard "current status" cards.  Like :func:`get_metrics`,
+    only a cache miss acquires a connection.
     """
-    cursor = con.cursor()
-    cursor.execute(sql, {"sid": server_id})
-    rows = cursor.fetchall()
-    if not rows:
+    hit, refresh = _latest_cache.get_stale(server_id)
+    if refresh:
+        background_tasks.add_task(_refresh, _latest_cache, server_id, _query_latest, server_id)
+    if hit is not MISSING:
+        return json_response(hit)
+
+    generation = _latest_cache.generation(server_id)
+    body = _query_or_503(_query_latest, server_id)
+    if body is None:
         raise HTTPException(status_code=404, detail=f"No metrics found for server {server_id}")
-    return [_row_to_metric(r) for r in rows]
+    _latest_cache.set(server_id, body, generation=generation)
+    return json_response(body)
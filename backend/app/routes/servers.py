@@ -8,24 +8,28 @@ from typing import Optional
 import oracledb
 from fastapi import APIRouter, Depends, HTTPException, Query
 
-from app.database import get_db
+from app.database import get_cursor
 from app.models import Environment, ServerCreate, ServerResponse, ServerType
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/servers", tags=["Servers"])
 
+# Rows per fetch round-trip for list_servers; the whole estate fits in one.
+_FETCH_ARRAYSIZE = 500
+
 
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def _row_to_server(row) -> dict:
+def _row_to_server(id, hostname, environment, type, active) -> dict:
+    """cursor.rowfactory for ``SELECT id, hostname, environment, type, active``."""
     return {
-        "id": row[0],
-        "hostname": row[1],
-        "environment": row[2],
-        "type": row[3],
-        "active": bool(row[4]),
+        "id": id,
+        "hostname": hostname,
+        "environment": environment,
+        "type": type,
+        "active": bool(active),
     }
 
 
@@ -38,7 +42,7 @@ def list_servers(
     environment: Optional[Environment] = Query(None, description="Filter by environment"),
     server_type: Optional[ServerType] = Query(None, alias="type", description="Filter by server type"),
     active_only: bool = Query(True, description="Return only active servers"),
-    con: oracledb.Connection = Depends(get_db),
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
 ):
     """
     Return all registered servers with optional filters.
@@ -59,42 +63,45 @@ def list_servers(
 
     sql += " ORDER BY environment, hostname"
 
-    cursor = con.cursor()
+    cursor.arraysize = _FETCH_ARRAYSIZE
+    cursor.prefetchrows = _FETCH_ARRAYSIZE + 1
     cursor.execute(sql, params)
-    rows = cursor.fetchall()
-    return [_row_to_server(r) for r in rows]
+    cursor.rowfactory = _row_to_server
+    return cursor.fetchall()
 
 
 @router.get("/{server_id}", response_model=ServerResponse)
-def get_server(server_id: int, con: oracledb.Connection = Depends(get_db)):
+def get_server(server_id: int, cursor: oracledb.Cursor = Depends(get_cursor, scope="function")):
     """Return a single server by ID."""
-    cursor = con.cursor()
     cursor.execute(
         "SELECT id, hostname, environment, type, active FROM servers WHERE id = :sid",
         {"sid": server_id},
     )
-    row = cursor.fetchone()
-    if not row:
+    cursor.rowfactory = _row_to_server
+    server = cursor.fetchone()
+    if not server:
         raise HTTPException(status_code=404, detail=f"Server {server_id} not found")
-    return _row_to_server(row)
+    return server
 
 
 @router.post("/", response_model=ServerResponse, status_code=201)
-def register_server(payload: ServerCreate, con: oracledb.Connection = Depends(get_db)):
+def register_server(
+    payload: ServerCreate,
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
+):
     """
     Register a new server.
     Returns the existing record if hostname already exists.
     """
-    cursor = con.cursor()
-
     # Upsert: return existing if already registered
     cursor.execute(
         "SELECT id, hostname, environment, type, active FROM servers WHERE hostname = :hn",
         {"hn": payload.hostname},
     )
+    cursor.rowfactory = _row_to_server
     existing = cursor.fetchone()
     if existing:
-        return _row_to_server(existing)
+        return existing
 
     new_id_var = cursor.var(int)
     cursor.execute(
@@ -114,17 +121,19 @@ def register_server(payload: ServerCreate, con: oracledb.Connection = Depends(ge
     val = new_id_var.getvalue()
     new_id = int(val[0] if isinstance(val, list) else val)
     logger.info("Registered new server: %s (id=%d)", payload.hostname, new_id)
-    return {**payload.dict(), "id": new_id}
+    return {**payload.model_dump(), "id": new_id}
 
 
 @router.patch("/{server_id}/deactivate", response_model=ServerResponse)
-def deactivate_server(server_id: int, con: oracledb.Connection = Depends(get_db)):
+def deactivate_server(
+    server_id: int,
+    cursor: oracledb.Cursor = Depends(get_cursor, scope="function"),
+):
     """Mark a server as inactive (soft-delete)."""
-    cursor = con.cursor()
     cursor.execute(
         "UPDATE servers SET active = 0 WHERE id = :sid",
         {"sid": server_id},
     )
     if cursor.rowcount == 0:
         raise HTTPException(status_code=404, detail=f"Server {server_id} not found")
-    return get_server(server_id, con)
+    return get_server(server_id, cursor)
@@ -3,11 +3,14 @@ services/alert_engine.py — Core alert evaluation and deduplication logic.
 
 The AlertEngine is instantiated once per metrics-ingest request.
 It:
-  1. Fetches threshold config for (metric_type, environment).
+  1. Prefetches the threshold config for the server's environment/hostname.
   2. Classifies the metric value as OK / WARNING / CRITICAL.
-  3. Suppresses duplicate open alerts for the same (server, metric, label).
-  4. Auto-resolves previously open alerts when value returns to OK.
-  5. Inserts new alert rows when thresholds are breached.
+  3. Auto-resolves previously open alerts when value returns to OK.
+  4. Inserts new alert rows when thresholds are breached, unless an open
+     alert already exists for the same (server, metric, label).
+
+A whole ingest payload is evaluated with evaluate_batch(): one read of the
+server's open alerts plus at most one bulk UPDATE and one bulk INSERT.
 """
 
 from __future__ import annotations
@@ -18,8 +21,21 @@ from typing import Optional
 
 import oracledb
 
+try:
+    import numpy as np
+except ImportError:  # optional; only large payloads benefit
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Payloads at least this long are classified with one vectorised NumPy
+# compare (when NumPy is installed); below it the array setup costs more
+# than the per-reading comparisons it replaces.
+_VECTORIZE_MIN_READINGS = 256
+
+# Severity code (as produced by _classify_batch) -> severity name.
+_SEVERITIES = ("OK", "WARNING", "CRITICAL")
+
 # Larger-is-worse metrics (percentage-based).  BLOCKING_SESSIONS and
 # LONG_RUNNING_QUERIES are count/duration-based — still larger-is-worse.
 _LARGER_IS_WORSE = {
@@ -28,6 +44,50 @@ _LARGER_IS_WORSE = {
 }
 
 
+# ---------------------------------------------------------------------------
+# SQL constants
+# ---------------------------------------------------------------------------
+
+_SQL_THRESHOLDS = """
+SELECT metric_type, hostname, path_label, warning_threshold, critical_threshold
+FROM   config
+WHERE  environment = :env
+  AND  hostname   IN (:hn, '')
+"""
+
+_SQL_OPEN_ALERT_KEYS = """
+SELECT metric, label
+FROM   alerts
+WHERE  server_id = :sid
+  AND  status   IN ('OPEN', 'ACKNOWLEDGED')
+"""
+
+_SQL_AUTO_RESOLVE = """
+UPDATE alerts
+SET    status      = 'RESOLVED',
+       resolved_at = SYS_EXTRACT_UTC(SYSTIMESTAMP)
+WHERE  server_id = :sid
+  AND  metric    = :metric
+  AND  (label    = :lbl OR (:lbl IS NULL AND label IS NULL))
+  AND  status   IN ('OPEN', 'ACKNOWLEDGED')
+"""
+
+_SQL_CREATE_ALERT = """
+INSERT INTO alerts
+    (server_id, metric, severity, label, value, message, status)
+SELECT :sid, :metric, :sev, :lbl, :val, :msg, 'OPEN'
+FROM   DUAL
+WHERE  NOT EXISTS (
+    SELECT 1
+    FROM   alerts
+    WHERE  server_id = :sid
+      AND  metric    = :metric
+      AND  (label    = :lbl OR (:lbl IS NULL AND label IS NULL))
+      AND  status   IN ('OPEN', 'ACKNOWLEDGED')
+)
+"""
+
+
 @dataclass
 class Threshold:
     warning: float
@@ -50,7 +110,7 @@ class AlertEngine:
         self._server_id = server_id
         self._environment = environment
         self._hostname = hostname or ''
-        self._threshold_cache: dict[str, Threshold | None] = {}
+        self._thresholds = self._load_thresholds()
 
     # ------------------------------------------------------------------
     # Public API
@@ -68,64 +128,84 @@ class AlertEngine:
         Returns True  if a new alert was created.
         Returns False if no alert action was taken (OK or duplicate suppressed).
         """
-        threshold = self._get_threshold(metric_type, label)
-        if threshold is None:
-            # No config defined — skip silently
-            return False
+        return self.evaluate_batch([(metric_type, value, label)]) > 0
 
-        severity = self._classify(value, threshold)
+    def evaluate_batch(self, readings: list[tuple[str, float, Optional[str]]]) -> int:
+        """
+        Evaluate a payload of ``(metric_type, value, label)`` readings.
 
-        if severity == "OK":
-            self._auto_resolve(metric_type, label)
-            return False
+        Severities are computed in memory, open alerts for the server are read
+        in one query, and the resulting auto-resolves and new alerts are each
+        written with a single ``executemany``.
 
-        # Check for existing open/acknowledged alert to suppress duplicates
-        if self._has_open_alert(metric_type, label):
-            logger.debug(
-                "Suppressed duplicate alert: server=%d metric=%s label=%s",
-                self._server_id,
-                metric_type,
-                label,
-            )
-            return False
+        Readings are folded in order into one net outcome per
+        ``(metric_type, label)``: an OK reading resolves an alert that was
+        open before the batch, and a breach with no alert open raises one
+        from that reading.  Unlike evaluating the readings one at a time,
+        a breach followed by an OK reading in the same batch cancels out —
+        no alert is created and then resolved, so it leaves no alert
+        history.
 
-        # Create new alert
-        message = (
-            f"{metric_type} is {value:.1f}% on "
-            f"{'[' + label + ']' if label else 'server'} "
-            f"({severity} threshold: "
-            f"{threshold.critical if severity == 'CRITICAL' else threshold.warning})"
-        )
-        self._cursor.execute(
-            """
-            INSERT INTO alerts
-                (server_id, metric, severity, label, value, message, status)
-            VALUES
-                (:sid, :metric, :sev, :lbl, :val, :msg, 'OPEN')
-            """,
-            {
-                "sid": self._server_id,
-                "metric": metric_type,
-                "sev": severity,
-                "lbl": label,
-                "val": value,
-                "msg": message,
-            },
-        )
-        logger.warning(
-            "ALERT created: server=%d metric=%s severity=%s value=%.1f label=%s",
-            self._server_id,
-            metric_type,
-            severity,
-            value,
-            label,
-        )
-        return True
+        Returns the number of new alerts created.
+        """
+        open_keys = self._open_alert_keys()
+        resolve: set[tuple[str, Optional[str]]] = set()
+        create: dict[tuple[str, Optional[str]], dict] = {}
+
+        thresholds = [self._get_threshold(mt, lbl) for mt, _, lbl in readings]
+        severities = self._classify_batch([value for _, value, _ in readings], thresholds)
+
+        for (metric_type, value, label), threshold, severity in zip(
+            readings, thresholds, severities
+        ):
+            if threshold is None:
+                # No config defined — skip silently
+                continue
+
+            key = (metric_type, label)
+            if severity == "OK":
+                if create.pop(key, None) is None and key in open_keys:
+                    resolve.add(key)
+                    open_keys.discard(key)
+            elif key in open_keys or key in create:
+                if logger.isEnabledFor(logging.DEBUG):  # per-metric path; DEBUG is usually off
+                    logger.debug(
+                        "Suppressed duplicate alert: server=%d metric=%s label=%s",
+                        self._server_id,
+                        metric_type,
+                        label,
+                    )
+            else:
+                create[key] = {
+                    "sid": self._server_id,
+                    "metric": metric_type,
+                    "sev": severity,
+                    "lbl": label,
+                    "val": value,
+                    "msg": self._message(metric_type, value, label, severity, threshold),
+                }
+
+        if resolve:
+            self._auto_resolve(resolve)
+        if not create:
+            return 0
+        return self._create_alerts(list(create.values()))
 
     # ------------------------------------------------------------------
     # Private helpers
     # ------------------------------------------------------------------
 
+    def _load_thresholds(self) -> dict[tuple[str, str, str], Threshold]:
+        """
+        Fetch every config row that can apply to this server in one query:
+        ``(metric_type, hostname, path_label) -> Threshold``.
+        """
+        self._cursor.execute(_SQL_THRESHOLDS, {"env": self._environment, "hn": self._hostname})
+        return {
+            (mt, hn, lbl): Threshold(warning=float(warn), critical=float(crit))
+            for mt, hn, lbl, warn, crit in self._cursor.fetchall()
+        }
+
     def _get_threshold(self, metric_type: str, label: Optional[str] = None) -> Optional[Threshold]:
         """
         Look up the most-specific threshold for this metric + value label.
@@ -133,32 +213,18 @@ class AlertEngine:
         Priority (highest wins):
           1. hostname + path_label  — per-server, per-path
           2. hostname only          — per-server, any path
-          3. environment global     — any server, any path
+          3. path_label only        — any server, per-path
+          4. environment global     — any server, any path
         """
         lbl = label or ''
         hn  = self._hostname
-        cache_key = f"{metric_type}:{hn}:{lbl}"
-        if cache_key not in self._threshold_cache:
-            self._cursor.execute(
-                """
-                SELECT warning_threshold, critical_threshold
-                FROM   config
-                WHERE  metric_type = :mt
-                  AND  environment  = :env
-                  AND  hostname    IN (:hn, '')
-                  AND  path_label  IN (:lbl, '')
-                ORDER BY
-                    CASE WHEN hostname   = :hn  AND hostname   <> '' THEN 0 ELSE 1 END +
-                    CASE WHEN path_label = :lbl AND path_label <> '' THEN 0 ELSE 1 END
-                FETCH FIRST 1 ROWS ONLY
-                """,
-                {"mt": metric_type, "env": self._environment, "hn": hn, "lbl": lbl},
-            )
-            row = self._cursor.fetchone()
-            self._threshold_cache[cache_key] = (
-                Threshold(warning=float(row[0]), critical=float(row[1])) if row else None
-            )
-        return self._threshold_cache[cache_key]
+        thresholds = self._thresholds
+        return (
+            thresholds.get((metric_type, hn, lbl))
+            or thresholds.get((metric_type, hn, ''))
+            or thresholds.get((metric_type, '', lbl))
+            or thresholds.get((metric_type, '', ''))
+        )
 
     def _classify(self, value: float, threshold: Threshold) -> str:
         """Return 'OK', 'WARNING', or 'CRITICAL'."""
@@ -168,48 +234,80 @@ class AlertEngine:
             return "WARNING"
         return "OK"
 
-    def _has_open_alert(self, metric_type: str, label: Optional[str]) -> bool:
-        """Check whether an open / acknowledged alert already exists."""
-        self._cursor.execute(
-            """
-            SELECT COUNT(*)
-            FROM   alerts
-            WHERE  server_id = :sid
-              AND  metric    = :metric
-              AND  (label    = :lbl OR (:lbl IS NULL AND label IS NULL))
-              AND  status   IN ('OPEN', 'ACKNOWLEDGED')
-            """,
-            {"sid": self._server_id, "metric": metric_type, "lbl": label},
+    def _classify_batch(
+        self, values: list[float], thresholds: list[Optional[Threshold]]
+    ) -> list[str]:
+        """
+        Classify every value against its threshold (entries without one come
+        back as 'OK' and are skipped by the caller).
+        """
+        if np is None or len(values) < _VECTORIZE_MIN_READINGS:
+            return [
+                "OK" if threshold is None else self._classify(value, threshold)
+                for value, threshold in zip(values, thresholds)
+            ]
+        n = len(values)
+        nan = float("nan")  # compares False, so readings without a threshold stay OK
+        vals = np.fromiter(values, dtype=np.float64, count=n)
+        warn = np.fromiter(
+            (nan if th is None else th.warning for th in thresholds), dtype=np.float64, count=n
+        )
+        crit = np.fromiter(
+            (nan if th is None else th.critical for th in thresholds), dtype=np.float64, count=n
+        )
+        codes = np.where(vals >= crit, 2, np.where(vals >= warn, 1, 0))
+        return [_SEVERITIES[code] for code in codes.tolist()]
+
+    def _message(
+        self, metric_type: str, value: float, label: Optional[str], severity: str, threshold: Threshold
+    ) -> str:
+        return (
+            f"{metric_type} is {value:.1f}% on "
+            f"{'[' + label + ']' if label else 'server'} "
+            f"({severity} threshold: "
+            f"{threshold.critical if severity == 'CRITICAL' else threshold.warning})"
         )
-        count = self._cursor.fetchone()[0]
-        return count > 0
-
-    def _auto_resolve(self, metric_type: str, label: Optional[str]) -> None:
-        """Resolve any open alerts for this metric now that the value is OK."""
-        from datetime import datetime  # local import avoids circular deps
-
-        self._cursor.execute(
-            """
-            UPDATE alerts
-            SET    status      = 'RESOLVED',
-                   resolved_at = :now
-            WHERE  server_id = :sid
-              AND  metric    = :metric
-              AND  (label    = :lbl OR (:lbl IS NULL AND label IS NULL))
-              AND  status   IN ('OPEN', 'ACKNOWLEDGED')
-            """,
-            {
-                "now": datetime.utcnow(),
-                "sid": self._server_id,
-                "metric": metric_type,
-                "lbl": label,
-            },
+
+    def _open_alert_keys(self) -> set[tuple[str, Optional[str]]]:
+        """(metric, label) of every OPEN / ACKNOWLEDGED alert on this server."""
+        self._cursor.execute(_SQL_OPEN_ALERT_KEYS, {"sid": self._server_id})
+        return set(self._cursor.fetchall())
+
+    def _auto_resolve(self, keys: set[tuple[str, Optional[str]]]) -> None:
+        """Resolve the open alerts for these (metric, label) pairs now that they are OK."""
+        self._cursor.executemany(
+            _SQL_AUTO_RESOLVE,
+            [
+                {"sid": self._server_id, "metric": metric, "lbl": label}
+                for metric, label in keys
+            ],
+        )
+        logger.info(
+            "Auto-resolved %d alert(s): server=%d metrics=%s",
+            self._cursor.rowcount,
+            self._server_id,
+            sorted(f"{metric}[{label or ''}]" for metric, label in keys),
         )
-        if self._cursor.rowcount:
-            logger.info(
-                "Auto-resolved %d alert(s): server=%d metric=%s label=%s",
-                self._cursor.rowcount,
+
+    def _create_alerts(self, rows: list[dict]) -> int:
+        """
+        Insert the new alerts in one array DML call.  The NOT EXISTS guard
+        still suppresses a duplicate opened by a concurrent ingest for the
+        same server; per-row counts from the same call tell which rows
+        actually became alerts.
+        """
+        self._cursor.executemany(_SQL_CREATE_ALERT, rows, arraydmlrowcounts=True)
+        created = 0
+        for row, count in zip(rows, self._cursor.getarraydmlrowcounts()):
+            if not count:
+                continue
+            created += 1
+            logger.warning(
+                "ALERT created: server=%d metric=%s severity=%s value=%.1f label=%s",
                 self._server_id,
-                metric_type,
-                label,
+                row["metric"],
+                row["sev"],
+                row["val"],
+                row["lbl"],
             )
+        return created
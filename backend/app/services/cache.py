@@ -0,0 +1,165 @@
+"""
+services/cache.py — Small in-process TTL cache for read endpoints.
+
+Each uvicorn worker keeps its own copy; entries expire after their TTL and
+can be dropped early by the write paths that make them stale.  A cache built
+with ``stale_ttl`` also serves entries for that long past expiry
+(stale-while-revalidate) and hands one caller at a time the job of
+refreshing them.  There is no
+shared cache tier in the RecSignal deployment, so this deliberately stays a
+thread-safe dict rather than a client for an external store.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Callable, Hashable
+
+# Returned by TTLCache.get() on a miss, so that None can be cached.
+MISSING: Any = object()
+
+
+class TTLCache:
+    """
+    Thread-safe ``key -> value`` store with a per-entry time-to-live.
+
+    Usage::
+
+        _cache = TTLCache(ttl=15.0)
+
+        hit = _cache.get(key)
+        if hit is not MISSING:
+            return hit
+        value = expensive()
+        _cache.set(key, value)
+
+    With ``stale_ttl`` use :meth:`get_stale`, which keeps returning an
+    expired value for ``stale_ttl`` more seconds and asks exactly one caller
+    to refresh it (others keep getting the stale value meanwhile)::
+
+        value, refresh = _cache.get_stale(key)
+        if refresh:
+            schedule(refresh_entry, key)   # must end in set() or release()
+
+    A value computed from data that a concurrent write may have changed
+    should be stored with the key's :meth:`generation` read *before* the
+    query; :meth:`set` drops it if an :meth:`invalidate` covering that key
+    happened in between, so a slow reader cannot put pre-write data back
+    after the write path has cleared it.  Fills for other keys are not
+    affected::
+
+        generation = _cache.generation(key)
+        value = expensive()
+        _cache.set(key, value, generation=generation)
+    """
+
+    def __init__(self, ttl: float, max_entries: int = 1024, stale_ttl: float = 0.0) -> None:
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._refreshing: set[Hashable] = set()
+        # Per-key invalidation counters for keys that have been filled with a
+        # generation.  Bounded like _entries: when it is reset, the epoch
+        # moves on and fills still holding the old epoch are dropped.
+        self._generations: dict[Hashable, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+
+    def generation(self, key: Hashable) -> tuple[int, int]:
+        """
+        Return the token to pass to :meth:`set` for ``key``; read it before
+        running the query whose result will be stored.
+        """
+        with self._lock:
+            if key not in self._generations:
+                if len(self._generations) >= self.max_entries:
+                    self._generations.clear()
+                    self._epoch += 1
+                self._generations[key] = 0
+            return self._epoch, self._generations[key]
+
+    def get(self, key: Hashable) -> Any:
+        """Return the cached value, or ``MISSING`` if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return MISSING
+        return entry[1]
+
+    def get_stale(self, key: Hashable) -> tuple[Any, bool]:
+        """
+        Return ``(value, refresh)``.
+
+        ``value`` is ``MISSING`` once the entry is more than ``stale_ttl``
+        past expiry.  ``refresh`` is True for the first caller to see the
+        entry expired but still servable; that caller owns the refresh until
+        it calls :meth:`set` or :meth:`release` for the key.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] + self.stale_ttl <= now:
+                return MISSING, False
+            if entry[0] > now or key in self._refreshing:
+                return entry[1], False
+            self._refreshing.add(key)
+            return entry[1], True
+
+    def release(self, key: Hashable) -> None:
+        """Give up a refresh claimed through :meth:`get_stale` (e.g. after an error)."""
+        with self._lock:
+            self._refreshing.discard(key)
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: float | None = None,
+        generation: tuple[int, int] | None = None,
+    ) -> None:
+        """
+        Store ``value`` under ``key``.  With ``generation``, the value is
+        discarded instead if ``key`` has been invalidated since that token
+        was read (any refresh claim on the key is released either way).
+        """
+        now = time.monotonic()
+        with self._lock:
+            if generation is not None and generation != (
+                self._epoch, self._generations.get(key)
+            ):
+                self._refreshing.discard(key)
+                return
+            if len(self._entries) >= self.max_entries:
+                # Query parameters are client-controlled; bound the key space.
+                self._entries = {
+                    k: e for k, e in self._entries.items() if e[0] + self.stale_ttl > now
+                }
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[key] = (now + (self.ttl if ttl is None else ttl), value)
+            self._refreshing.discard(key)
+
+    def delete(self, key: Hashable) -> None:
+        """Drop ``key`` and any refresh claim on it, leaving generations alone."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._refreshing.discard(key)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool]) -> None:
+        """
+        Drop every entry whose key satisfies ``predicate`` and bump those
+        keys' generations, so fills for them already in flight are discarded.
+        """
+        with self._lock:
+            for key in [k for k in self._generations if predicate(k)]:
+                self._generations[key] += 1
+            for key in [k for k in self._entries if predicate(k)]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._generations.clear()
+            self._epoch += 1
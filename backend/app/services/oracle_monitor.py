@@ -8,11 +8,18 @@ Can also be imported in unit tests without a live DB by mocking the connection.
 from __future__ import annotations
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Iterator, Optional
 
 logger = logging.getLogger(__name__)
 
+# Rows per fetch round-trip for list queries (default is 100).  Sized so a
+# result (e.g. the tablespace list) arrives in one trip; prefetchrows = arraysize + 1 also
+# returns the end-of-fetch marker with the execute.
+_FETCH_ARRAYSIZE = 500
+
 
 # ---------------------------------------------------------------------------
 # Data classes
@@ -106,7 +113,7 @@ FROM
 WHERE
     s.status   = 'ACTIVE'
     AND s.type != 'BACKGROUND'
-    AND q.elapsed_time > 300000000   -- > 5 minutes (microseconds)
+    AND q.elapsed_time >= :min_us    -- microseconds
 ORDER BY elapsed_minutes DESC
 """
 
@@ -122,10 +129,27 @@ class OracleMonitor:
     Parameters
     ----------
     connection : An active ``oracledb.Connection`` to the target database.
+    pool       : Alternatively, an ``oracledb.ConnectionPool`` (max >= 3).
+                 Each collector then acquires its own connection and
+                 :meth:`collect_all` runs the three queries concurrently.
     """
 
-    def __init__(self, connection) -> None:
+    def __init__(self, connection=None, *, pool=None) -> None:
+        if (connection is None) == (pool is None):
+            raise ValueError("Pass exactly one of connection or pool.")
         self._con = connection
+        self._pool = pool
+
+    @contextmanager
+    def _cursor(self) -> Iterator:
+        """Cursor on the shared connection, or on one acquired from the pool."""
+        if self._pool is None:
+            with self._con.cursor() as cursor:
+                yield cursor
+            return
+        with self._pool.acquire() as con:
+            with con.cursor() as cursor:
+                yield cursor
 
     # ------------------------------------------------------------------
     # Tablespace
@@ -134,11 +158,11 @@ class OracleMonitor:
     def collect_tablespace_usage(self) -> list[TablespaceMetric]:
         """Query DBA_DATA_FILES / DBA_FREE_SPACE for tablespace fill rates."""
         try:
-            cursor = self._con.cursor()
-            cursor.execute(_SQL_TABLESPACE)
-            results = []
-            for row in cursor.fetchall():
-                results.append(
+            with self._cursor() as cursor:
+                cursor.arraysize = _FETCH_ARRAYSIZE
+                cursor.prefetchrows = _FETCH_ARRAYSIZE + 1
+                cursor.execute(_SQL_TABLESPACE)
+                return [
                     TablespaceMetric(
                         name=row[0],
                         total_mb=float(row[1]),
@@ -146,8 +170,8 @@ class OracleMonitor:
                         free_mb=float(row[3]),
                         use_percent=float(row[4]),
                     )
-                )
-            return results
+                    for row in cursor
+                ]
         except Exception as exc:
             logger.error("Failed to collect tablespace usage: %s", exc)
             return []
@@ -162,11 +186,11 @@ class OracleMonitor:
         Returns a list of :class:`BlockingSession` ordered by blocked_count desc.
         """
         try:
-            cursor = self._con.cursor()
-            cursor.execute(_SQL_BLOCKING)
-            results = []
-            for row in cursor.fetchall():
-                results.append(
+            with self._cursor() as cursor:
+                cursor.arraysize = _FETCH_ARRAYSIZE
+                cursor.prefetchrows = _FETCH_ARRAYSIZE + 1
+                cursor.execute(_SQL_BLOCKING)
+                return [
                     BlockingSession(
                         blocking_sid=int(row[0]),
                         blocking_serial=int(row[1]),
@@ -175,8 +199,8 @@ class OracleMonitor:
                         blocking_program=row[4],
                         wait_event=row[5],
                     )
-                )
-            return results
+                    for row in cursor
+                ]
         except Exception as exc:
             logger.error("Failed to collect blocking sessions: %s", exc)
             return []
@@ -194,24 +218,24 @@ class OracleMonitor:
         *min_elapsed_minutes* minutes.
         """
         try:
-            cursor = self._con.cursor()
-            cursor.execute(_SQL_LONG_RUNNING)
-            results = []
-            for row in cursor.fetchall():
-                elapsed = float(row[4])
-                if elapsed >= min_elapsed_minutes:
-                    results.append(
-                        LongRunningQuery(
-                            sid=int(row[0]),
-                            serial=int(row[1]),
-                            username=row[2],
-                            sql_id=row[3],
-                            elapsed_minutes=elapsed,
-                            status=row[5],
-                            program=row[6],
-                        )
+            with self._cursor() as cursor:
+                cursor.arraysize = _FETCH_ARRAYSIZE
+                cursor.prefetchrows = _FETCH_ARRAYSIZE + 1
+                cursor.execute(
+                    _SQL_LONG_RUNNING, {"min_us": int(min_elapsed_minutes * 60_000_000)}
+                )
+                return [
+                    LongRunningQuery(
+                        sid=int(row[0]),
+                        serial=int(row[1]),
+                        username=row[2],
+                        sql_id=row[3],
+                        elapsed_minutes=float(row[4]),
+                        status=row[5],
+                        program=row[6],
                     )
-            return results
+                    for row in cursor
+                ]
         except Exception as exc:
             logger.error("Failed to collect long running queries: %s", exc)
             return []
@@ -221,7 +245,24 @@ class OracleMonitor:
     # ------------------------------------------------------------------
 
     def collect_all(self) -> OracleMetrics:
-        """Collect all Oracle metrics and return as an :class:`OracleMetrics` instance."""
+        """
+        Collect all Oracle metrics and return as an :class:`OracleMetrics` instance.
+
+        With a pool the three queries run concurrently on separate
+        connections (python-oracledb releases the GIL while waiting on the
+        database), so the elapsed time is that of the slowest one.  A single
+        connection serialises its calls, so they run one after another.
+        """
+        if self._pool is not None:
+            with ThreadPoolExecutor(max_workers=3) as executor:
+                tablespaces = executor.submit(self.collect_tablespace_usage)
+                blocking = executor.submit(self.collect_blocking_sessions)
+                long_running = executor.submit(self.collect_long_running_queries)
+                return OracleMetrics(
+                    tablespaces=tablespaces.result(),
+                    blocking_sessions=blocking.result(),
+                    long_running_queries=long_running.result(),
+                )
         return OracleMetrics(
             tablespaces=self.collect_tablespace_usage(),
             blocking_sessions=self.collect_blocking_sessions(),
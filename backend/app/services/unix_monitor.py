@@ -7,8 +7,11 @@ They can also be imported here on the backend for integration tests.
 
 from __future__ import annotations
 
-import shutil
-import subprocess
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Generator
 
@@ -28,111 +31,181 @@ class SystemMetric:
     cpu_load_1m: float       # 1-minute load average (expressed as %)
     memory_use_percent: float
     swap_use_percent: float
+    cpu_use_percent: float = 0.0   # busy share of all CPUs since the previous collection
     disks: list[DiskMetric] = field(default_factory=list)
 
 
+# ---------------------------------------------------------------------------
+# procfs access
+# ---------------------------------------------------------------------------
+
+class _ProcFile:
+    """
+    A procfs file kept open for the life of the process.
+
+    procfs regenerates a file's content on every read from offset 0, so
+    each :meth:`read` is a ``preadv`` into a buffer reused across calls,
+    on the same descriptor, instead of an open/read/close through Python's
+    I/O stack per collection.
+    """
+
+    def __init__(self, path: str, size: int = 8192) -> None:
+        self.path = path
+        self._fd: int | None = None
+        self._buf = bytearray(size)
+        self._lock = threading.Lock()
+
+    def read(self) -> str:
+        with self._lock:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_RDONLY | os.O_CLOEXEC)
+            n = 0
+            while True:
+                if n == len(self._buf):
+                    self._buf.extend(bytes(len(self._buf)))  # file outgrew it; double
+                got = os.preadv(self._fd, [memoryview(self._buf)[n:]], n)
+                if not got:
+                    break
+                n += got
+            return str(memoryview(self._buf)[:n], "utf-8", "replace")
+
+
+_LOADAVG = _ProcFile("/proc/loadavg")
+_STAT = _ProcFile("/proc/stat")
+_MEMINFO = _ProcFile("/proc/meminfo")
+_MOUNTINFO = _ProcFile("/proc/self/mountinfo")
+
+
 # ---------------------------------------------------------------------------
 # Disk usage
 # ---------------------------------------------------------------------------
 
+_GIB = 1024 ** 3
+
+# One /proc/self/mountinfo line, capturing only the mount point, fstype and
+# source:
+#   <id> <parent> <maj:min> <root> <mount point> <opts> [optional...] - <fstype> <source> <superopts>
+_MOUNTINFO_RE = re.compile(
+    r"^\S+ \S+ \S+ \S+ (\S+) \S+(?: \S+)*? - (\S+) (\S+)", re.MULTILINE
+)
+
+_OCTAL_ESCAPE_RE = re.compile(r"\\([0-7]{3})")
+
+
+def _unescape_mount(path: str) -> str:
+    """Decode the octal escapes (``\\040`` for space, etc.) used in mountinfo."""
+    return _OCTAL_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), path)
+
+
 def collect_disk_usage(exclude_fs: tuple[str, ...] = ("tmpfs", "devtmpfs", "udev")) -> list[DiskMetric]:
     """
-    Run ``df -Ph`` and parse each filesystem entry.
+    Read ``/proc/self/mountinfo`` once and ``os.statvfs`` each mount point.
 
-    Excludes pseudo-filesystems listed in *exclude_fs*.
+    Mounts whose filesystem type or source is listed in *exclude_fs* are
+    skipped, as are size-less pseudo filesystems (``df`` hides those too).
+    Percentages follow ``df -P``: used / (used + available to users).
     Returns a list of :class:`DiskMetric` instances.
     """
-    result = subprocess.run(
-        ["df", "-Ph"], capture_output=True, text=True, timeout=15
-    )
-    metrics: list[DiskMetric] = []
-    lines = result.stdout.strip().splitlines()
-
-    for line in lines[1:]:           # skip header
-        parts = line.split()
-        if len(parts) < 6:
-            continue
-        fs_type_cmd = subprocess.run(
-            ["stat", "-f", "-c", "%T", parts[5]], capture_output=True, text=True
-        )
-        fs_label = fs_type_cmd.stdout.strip() if fs_type_cmd.returncode == 0 else ""
-        if any(ex in fs_label for ex in exclude_fs):
+    excluded = frozenset(exclude_fs)
+    by_mount: dict[str, DiskMetric] = {}
+    for m in _MOUNTINFO_RE.finditer(_MOUNTINFO.read()):
+        raw_mount, fs_type, source = m.groups()
+        if fs_type in excluded or source in excluded:
             continue
 
+        mount_point = _unescape_mount(raw_mount)
         try:
-            use_pct = float(parts[4].replace("%", ""))
-        except ValueError:
+            st = os.statvfs(mount_point)
+        except OSError:
             continue
-
-        def _to_gb(s: str) -> float:
-            s = s.upper()
-            if s.endswith("G"):
-                return float(s[:-1])
-            if s.endswith("M"):
-                return float(s[:-1]) / 1024
-            if s.endswith("T"):
-                return float(s[:-1]) * 1024
-            return float(s) / (1024 ** 3)  # assume bytes
-
-        metrics.append(
-            DiskMetric(
-                mount_point=parts[5],
-                total_gb=_to_gb(parts[1]),
-                used_gb=_to_gb(parts[2]),
-                free_gb=_to_gb(parts[3]),
-                use_percent=use_pct,
-            )
-        )
-
-    # Inode usage
-    inode_result = subprocess.run(
-        ["df", "-Pi"], capture_output=True, text=True, timeout=15
-    )
-    inode_map: dict[str, float] = {}
-    for line in inode_result.stdout.strip().splitlines()[1:]:
-        parts = line.split()
-        if len(parts) < 6 or parts[4] == "-":
+        if st.f_blocks == 0:
             continue
-        try:
-            inode_map[parts[5]] = float(parts[4].replace("%", ""))
-        except ValueError:
-            pass
 
-    for dm in metrics:
-        dm.inode_use_percent = inode_map.get(dm.mount_point, 0.0)
+        used = st.f_blocks - st.f_bfree
+        avail_total = used + st.f_bavail
+        # Last mount on a path wins: it is the one visible there, as with df.
+        by_mount[mount_point] = DiskMetric(
+            mount_point=mount_point,
+            total_gb=round(st.f_blocks * st.f_frsize / _GIB, 2),
+            used_gb=round(used * st.f_frsize / _GIB, 2),
+            free_gb=round(st.f_bavail * st.f_frsize / _GIB, 2),
+            use_percent=round(used / avail_total * 100, 2) if avail_total else 0.0,
+            inode_use_percent=(
+                round((st.f_files - st.f_ffree) / st.f_files * 100, 2) if st.f_files else 0.0
+            ),
+        )
 
-    return metrics
+    return list(by_mount.values())
 
 
 # ---------------------------------------------------------------------------
 # CPU / Memory
 # ---------------------------------------------------------------------------
 
+# Logical CPU count is fixed for the life of the process.
+_CPU_COUNT = os.cpu_count() or 1
+
+# The /proc/meminfo fields collect_memory_usage needs (all near the top).
+_MEMINFO_KEYS = frozenset({"MemTotal", "MemAvailable", "SwapTotal", "SwapFree"})
+
+# collect_memory_usage result is reused for this long; callers polling more
+# often than that get the same (monotonic time, value) snapshot.
+_MEMORY_TTL_SECONDS = 1.0
+# (idle, total) jiffies from the previous collect_cpu_usage call.
+_cpu_prev: tuple[int, int] | None = None
+_cpu_lock = threading.Lock()
+
+# Replaced as a whole tuple, so concurrent readers always see a consistent pair.
+_memory_cache: tuple[float, tuple[float, float]] | None = None
+
 def collect_cpu_load() -> float:
     """
     Return 1-minute load average as a rough CPU usage percentage.
     Divides raw load average by number of logical CPUs.
     """
-    with open("/proc/loadavg") as f:
-        load_1m = float(f.read().split()[0])
+    load_1m = float(_LOADAVG.read().split()[0])
+    return min(round((load_1m / _CPU_COUNT) * 100, 2), 100.0)
 
-    cpu_count = len([
-        ln for ln in open("/proc/cpuinfo").readlines()
-        if ln.startswith("processor")
-    ]) or 1
 
-    return min(round((load_1m / cpu_count) * 100, 2), 100.0)
+def collect_cpu_usage() -> float:
+    """
+    Return CPU utilisation % across all CPUs from the aggregate ``cpu`` line
+    of /proc/stat, measured since the previous call (since boot on the
+    first call).  Non-blocking: the previous snapshot is kept in-process.
+    """
+    global _cpu_prev
+    # cpu  user nice system idle iowait irq softirq steal guest guest_nice
+    # (guest time is already included in user/nice, so only 8 fields count)
+    fields = [int(v) for v in _STAT.read().split("\n", 1)[0].split()[1:9]]
+    idle = fields[3] + fields[4]
+    total = sum(fields)
+    with _cpu_lock:
+        prev_idle, prev_total = _cpu_prev or (0, 0)
+        _cpu_prev = (idle, total)
+    d_total = total - prev_total
+    if d_total <= 0:
+        return 0.0
+    return round((1 - (idle - prev_idle) / d_total) * 100, 2)
 
 
 def collect_memory_usage() -> tuple[float, float]:
     """
     Returns (memory_use_percent, swap_use_percent) from /proc/meminfo.
+    Results are cached for ``_MEMORY_TTL_SECONDS``.
     """
+    global _memory_cache
+    now = time.monotonic()
+    cached = _memory_cache
+    if cached is not None and now - cached[0] < _MEMORY_TTL_SECONDS:
+        return cached[1]
+
     mem_info: dict[str, int] = {}
-    with open("/proc/meminfo") as f:
-        for line in f:
-            key, _, val = line.partition(":")
-            mem_info[key.strip()] = int(val.split()[0])  # kB
+    for line in _MEMINFO.read().splitlines():
+        key, _, val = line.partition(":")
+        if key in _MEMINFO_KEYS:
+            mem_info[key] = int(val.split()[0])  # kB
+            if len(mem_info) == len(_MEMINFO_KEYS):
+                break
 
     mem_total = mem_info.get("MemTotal", 1)
     mem_avail = mem_info.get("MemAvailable", 0)
@@ -142,6 +215,7 @@ def collect_memory_usage() -> tuple[float, float]:
     swap_free = mem_info.get("SwapFree", 0)
     swap_pct = round((1 - swap_free / swap_total) * 100, 2) if swap_total else 0.0
 
+    _memory_cache = (now, (mem_pct, swap_pct))
     return mem_pct, swap_pct
 
 
@@ -153,8 +227,21 @@ def collect_all() -> SystemMetric:
     """
     Collect all system metrics in one call.
     Returns a :class:`SystemMetric` dataclass.
+
+    The collectors are independent and I/O bound (``statvfs`` on possibly
+    slow or network mounts, procfs reads), so they run side by side and the
+    elapsed time is that of the slowest, typically the disk scan.
     """
-    disks = collect_disk_usage()
-    cpu = collect_cpu_load()
-    mem, swap = collect_memory_usage()
-    return SystemMetric(cpu_load_1m=cpu, memory_use_percent=mem, swap_use_percent=swap, disks=disks)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        disks = executor.submit(collect_disk_usage)
+        cpu = executor.submit(collect_cpu_load)
+        cpu_use = executor.submit(collect_cpu_usage)
+        memory = executor.submit(collect_memory_usage)
+        mem, swap = memory.result()
+        return SystemMetric(
+            cpu_load_1m=cpu.result(),
+            memory_use_percent=mem,
+            swap_use_percent=swap,
+            cpu_use_percent=cpu_use.result(),
+            disks=disks.result(),
+        )
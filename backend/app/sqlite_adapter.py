@@ -8,7 +8,8 @@ so all route and service code works unchanged.
 SQL translation (automatic):
   FETCH FIRST N ROWS ONLY  →  LIMIT N
   FROM DUAL                →  (removed)
-  RETURNING id INTO :var   →  (removed; lastrowid is used instead)
+  SYS_EXTRACT_UTC(SYSTIMESTAMP) → current UTC time (millisecond precision)
+  RETURNING cols INTO :vars →  RETURNING cols (values copied into the VarProxies)
 """
 
 from __future__ import annotations
@@ -17,13 +18,24 @@ import logging
 import os
 import re
 import sqlite3
+import threading
 from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Callable, Iterator, Optional
+
+from app.models import DEFAULT_THRESHOLDS
 
 logger = logging.getLogger(__name__)
 
 SQLITE_PATH = os.getenv("SQLITE_PATH", "recsignal_dev.db")
+# Idle connections kept open for reuse (see get_sqlite_connection).
+SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", "8"))
+
+# Return DATETIME columns as datetime objects (as oracledb does for TIMESTAMP)
+# rather than ISO strings; routes build response models from rows unvalidated.
+sqlite3.register_converter("DATETIME", lambda b: datetime.fromisoformat(b.decode()))
 
 # ---------------------------------------------------------------------------
 # SQLite DDL (CREATE TABLE IF NOT EXISTS — fully idempotent)
@@ -47,6 +59,8 @@ SQLITE_DDL = [
         timestamp   DATETIME DEFAULT CURRENT_TIMESTAMP
     )""",
     "CREATE INDEX IF NOT EXISTS idx_metrics_server_ts ON metrics(server_id, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_metrics_latest "
+    "ON metrics(server_id, metric_type, label, timestamp DESC)",
     """CREATE TABLE IF NOT EXISTS alerts (
         id              INTEGER  PRIMARY KEY AUTOINCREMENT,
         server_id       INTEGER  NOT NULL REFERENCES servers(id),
@@ -60,6 +74,9 @@ SQLITE_DDL = [
         created_at      DATETIME DEFAULT CURRENT_TIMESTAMP,
         resolved_at     DATETIME
     )""",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_created_desc "
+    "ON alerts(created_at DESC, status, severity, server_id)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_open ON alerts(server_id, status, metric, label)",
     """CREATE TABLE IF NOT EXISTS config (
         id                  INTEGER PRIMARY KEY AUTOINCREMENT,
         metric_type         TEXT    NOT NULL,
@@ -68,55 +85,93 @@ SQLITE_DDL = [
         path_label          TEXT    NOT NULL DEFAULT '',
         warning_threshold   REAL    NOT NULL,
         critical_threshold  REAL    NOT NULL,
-        UNIQUE(metric_type, environment, hostname, path_label)
+        UNIQUE(metric_type, environment, hostname, path_label),
+        CONSTRAINT chk_config_thresholds CHECK (warning_threshold < critical_threshold)
     )""",
     # ── Migration: add columns to existing dev databases (safe to re-run) ────────
-    # init_sqlite() catches sqlite3.Error so these silently no-op on new DBs.
+    # init_sqlite() skips these when the column already exists.
     "ALTER TABLE config ADD COLUMN hostname   TEXT NOT NULL DEFAULT ''",
     "ALTER TABLE config ADD COLUMN path_label TEXT NOT NULL DEFAULT ''",
-    # Seed default thresholds (INSERT OR IGNORE = no-op if already present)
-    """INSERT OR IGNORE INTO config
-        (metric_type, environment, warning_threshold, critical_threshold)
-    SELECT 'DISK_USAGE',           'DEV',  70,  90 UNION ALL
-    SELECT 'DISK_USAGE',           'UAT',  70,  85 UNION ALL
-    SELECT 'DISK_USAGE',           'PROD', 75,  90 UNION ALL
-    SELECT 'INODE_USAGE',          'DEV',  70,  90 UNION ALL
-    SELECT 'INODE_USAGE',          'UAT',  70,  85 UNION ALL
-    SELECT 'INODE_USAGE',          'PROD', 75,  90 UNION ALL
-    SELECT 'MEMORY_USAGE',         'DEV',  75,  90 UNION ALL
-    SELECT 'MEMORY_USAGE',         'UAT',  75,  90 UNION ALL
-    SELECT 'MEMORY_USAGE',         'PROD', 80,  95 UNION ALL
-    SELECT 'CPU_LOAD',             'DEV',  70,  90 UNION ALL
-    SELECT 'CPU_LOAD',             'UAT',  70,  90 UNION ALL
-    SELECT 'CPU_LOAD',             'PROD', 75,  95 UNION ALL
-    SELECT 'TABLESPACE_USAGE',     'DEV',  75,  90 UNION ALL
-    SELECT 'TABLESPACE_USAGE',     'UAT',  75,  90 UNION ALL
-    SELECT 'TABLESPACE_USAGE',     'PROD', 80,  95 UNION ALL
-    SELECT 'BLOCKING_SESSIONS',    'DEV',   5,  20 UNION ALL
-    SELECT 'BLOCKING_SESSIONS',    'UAT',   5,  20 UNION ALL
-    SELECT 'BLOCKING_SESSIONS',    'PROD',  2,  10 UNION ALL
-    SELECT 'LONG_RUNNING_QUERIES', 'DEV',  30, 120 UNION ALL
-    SELECT 'LONG_RUNNING_QUERIES', 'UAT',  30, 120 UNION ALL
-    SELECT 'LONG_RUNNING_QUERIES', 'PROD', 15,  60""",
+    # SQLite cannot add a CHECK to an existing table, so dev databases created
+    # before chk_config_thresholds get the same rule (and error text, which
+    # routes/config.py maps to 422) from triggers.
+    """CREATE TRIGGER IF NOT EXISTS chk_config_thresholds_ins
+    BEFORE INSERT ON config
+    WHEN NEW.warning_threshold >= NEW.critical_threshold
+    BEGIN
+        SELECT RAISE(ABORT, 'CHECK constraint failed: chk_config_thresholds');
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS chk_config_thresholds_upd
+    BEFORE UPDATE ON config
+    WHEN NEW.warning_threshold >= NEW.critical_threshold
+    BEGIN
+        SELECT RAISE(ABORT, 'CHECK constraint failed: chk_config_thresholds');
+    END""",
 ]
 
 # ---------------------------------------------------------------------------
 # SQL translator — Oracle → SQLite
 # ---------------------------------------------------------------------------
 
-_FETCH_RE     = re.compile(r'FETCH\s+FIRST\s+(\S+)\s+ROWS\s+ONLY', re.IGNORECASE)
-_DUAL_RE      = re.compile(r'\bFROM\s+DUAL\b', re.IGNORECASE)
-_RETURNING_RE = re.compile(r'\s*RETURNING\s+\w+\s+INTO\s+:\w+', re.IGNORECASE)
+# One alternation, so the translator makes a single pass over the SQL text.
+_ORACLE_RE = re.compile(
+    r"(?P<dual>\bFROM\s+DUAL\b)"
+    r"|(?P<utcnow>SYS_EXTRACT_UTC\s*\(\s*SYSTIMESTAMP\s*\))"
+    r"|FETCH\s+FIRST\s+(?P<fetch>\S+)\s+ROWS\s+ONLY"
+    r"|\bRETURNING\s+(?P<ret_cols>.+?)\s+INTO\s+(?P<ret_binds>:\w+(?:\s*,\s*:\w+)*)\s*$",
+    re.IGNORECASE | re.DOTALL,
+)
+
+# Every _ORACLE_RE alternative contains one of these; SQL without any of them
+# needs no translation at all.
+_ORACLE_MARKERS = ("DUAL", "SYSTIMESTAMP", "FETCH", "RETURNING")
+
 
+@lru_cache(maxsize=512)
+def _translate_sql(sql: str) -> tuple[str, tuple[str, ...]]:
+    """
+    Oracle SQL text -> (SQLite SQL text, names of the ``RETURNING ... INTO``
+    binds in column order).  Cached: the application issues a fixed set of
+    statement texts, so each is translated once per process.
+    """
+    upper = sql.upper()
+    if not any(marker in upper for marker in _ORACLE_MARKERS):
+        return sql.strip(), ()
+
+    out_binds: tuple[str, ...] = ()
+
+    def _sub(m: re.Match) -> str:
+        nonlocal out_binds
+        kind = m.lastgroup
+        if kind == "dual":
+            return ""
+        if kind == "utcnow":
+            return "STRFTIME('%Y-%m-%d %H:%M:%f', 'now')"
+        if kind == "fetch":
+            return f"LIMIT {m.group('fetch')}"
+        out_binds = tuple(b.strip()[1:] for b in m.group("ret_binds").split(","))
+        return f"RETURNING {m.group('ret_cols')}"
+
+    return _ORACLE_RE.sub(_sub, sql).strip(), out_binds
+
+
+def _translate(
+    sql: str, params: Optional[dict]
+) -> tuple[str, Optional[dict], tuple[_VarProxy, ...]]:
+    """
+    Translate Oracle-specific SQL to SQLite-compatible SQL.
 
-def _translate(sql: str, params: Optional[dict]) -> tuple[str, Optional[dict]]:
-    """Translate Oracle-specific SQL to SQLite-compatible SQL."""
-    sql = _DUAL_RE.sub('', sql)
-    sql = _FETCH_RE.sub(r'LIMIT \1', sql)
-    sql = _RETURNING_RE.sub('', sql)           # handled via lastrowid
-    if params and isinstance(params, dict):
-        params = {k: v for k, v in params.items() if not isinstance(v, _VarProxy)}
-    return sql.strip(), params
+    Also returns the VarProxies bound to a ``RETURNING ... INTO`` clause, in
+    column order, so execute() can fill them from SQLite's native RETURNING.
+    VarProxies are only ever bound there, so statements without one (nearly
+    all of them) pass their params through untouched.
+    """
+    sql, out_binds = _translate_sql(sql)
+    if not out_binds:
+        return sql, params, ()
+    out_vars = tuple(params[b] for b in out_binds)
+    params = {k: v for k, v in params.items() if k not in out_binds}
+    return sql, params, out_vars
 
 
 # ---------------------------------------------------------------------------
@@ -126,14 +181,18 @@ def _translate(sql: str, params: Optional[dict]) -> tuple[str, Optional[dict]]:
 class _VarProxy:
     """
     Returned by CursorAdapter.var().
-    After execute(), its internal value is set to cursor.lastrowid.
+    After a DML ``RETURNING ... INTO`` execute() it holds one value per
+    affected row, like an oracledb OUT variable.
     Routes call: val = proxy.getvalue(); id = val[0] if isinstance(val, list) else val
     """
+
+    __slots__ = ("_values",)
+
     def __init__(self) -> None:
-        self._value: Optional[int] = None
+        self._values: list = []
 
     def getvalue(self) -> list:
-        return [self._value]
+        return self._values
 
 
 # ---------------------------------------------------------------------------
@@ -143,19 +202,33 @@ class _VarProxy:
 class _CursorAdapter:
     """Wraps sqlite3.Cursor with an oracledb-compatible interface."""
 
+    __slots__ = (
+        "_cur", "_con", "rowcount", "arraysize", "prefetchrows", "rowfactory", "_row_counts",
+    )
+
     def __init__(self, cur: sqlite3.Cursor, con_adapter: "_ConnectionAdapter") -> None:
         self._cur = cur
         self._con = con_adapter
         self.rowcount: int = 0
+        # Fetch tuning knobs accepted for oracledb parity; sqlite3 ignores them.
+        self.arraysize: int = 100
+        self.prefetchrows: int = 2
+        # Called as rowfactory(*row) on every fetched row; like oracledb's,
+        # it is reset by each execute().
+        self.rowfactory: Optional[Callable[..., Any]] = None
+        self._row_counts: list[int] = []
+
+    @property
+    def connection(self) -> "_ConnectionAdapter":
+        return self._con
 
     def var(self, typ: Any) -> _VarProxy:
-        """Create a VarProxy — populated with lastrowid after execute()."""
-        proxy = _VarProxy()
-        self._con._pending_proxies.append(proxy)
-        return proxy
+        """Create a VarProxy for use as a ``RETURNING ... INTO`` bind."""
+        return _VarProxy()
 
     def execute(self, sql: str, params: Optional[dict] = None) -> None:
-        sql, params = _translate(sql, params)
+        self.rowfactory = None
+        sql, params, out_vars = _translate(sql, params)
         try:
             if params:
                 self._cur.execute(sql, params)
@@ -167,20 +240,73 @@ class _CursorAdapter:
             logger.error("SQLite execute error: %s | SQL: %.200s", exc, sql)
             raise
 
+        if out_vars:
+            rows = self._cur.fetchall()
+            for i, proxy in enumerate(out_vars):
+                proxy._values = [r[i] for r in rows]
+            self.rowcount = len(rows)
+        else:
+            self.rowcount = self._cur.rowcount
+
+    def executemany(self, sql: str, seq_of_params: list, arraydmlrowcounts: bool = False) -> None:
+        sql, _, _ = _translate(sql, None)
+        try:
+            if arraydmlrowcounts:
+                # sqlite3 has no per-row counts for executemany; run the rows
+                # one by one (dev only) to provide getarraydmlrowcounts().
+                self._row_counts = []
+                for params in seq_of_params:
+                    self._cur.execute(sql, params)
+                    self._row_counts.append(self._cur.rowcount)
+                self.rowcount = sum(self._row_counts)
+                return
+            self._cur.executemany(sql, seq_of_params)
+        except sqlite3.IntegrityError:
+            raise
+        except sqlite3.Error as exc:
+            logger.error("SQLite executemany error: %s | SQL: %.200s", exc, sql)
+            raise
         self.rowcount = self._cur.rowcount
-        # Populate VarProxies with the inserted row id
-        for proxy in self._con._pending_proxies:
-            proxy._value = self._cur.lastrowid
-        self._con._pending_proxies.clear()
 
-    def fetchone(self) -> Optional[tuple]:
+    def getarraydmlrowcounts(self) -> list[int]:
+        return self._row_counts
+
+    # Pooled connections return plain tuples (no row_factory), which is what
+    # oracledb returns too, so rows pass through without conversion.
+
+    def fetchone(self) -> Any:
         row = self._cur.fetchone()
-        if row is None:
-            return None
-        return tuple(row)          # sqlite3.Row → plain tuple (matches oracledb)
+        if row is None or self.rowfactory is None:
+            return row
+        return self.rowfactory(*row)
+
+    def fetchmany(self, size: Optional[int] = None) -> list:
+        rows = self._cur.fetchmany(self.arraysize if size is None else size)
+        if self.rowfactory is None:
+            return rows
+        factory = self.rowfactory
+        return [factory(*r) for r in rows]
+
+    def fetchall(self) -> list:
+        if self.rowfactory is None:
+            return self._cur.fetchall()
+        factory = self.rowfactory
+        return [factory(*r) for r in self._cur]
+
+    def __iter__(self) -> Iterator:
+        if self.rowfactory is not None:
+            factory = self.rowfactory
+            return (factory(*r) for r in self._cur)
+        return iter(self._cur)
 
-    def fetchall(self) -> list[tuple]:
-        return [tuple(r) for r in self._cur.fetchall()]
+    def close(self) -> None:
+        self._cur.close()
+
+    def __enter__(self) -> "_CursorAdapter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
 
 
 # ---------------------------------------------------------------------------
@@ -190,9 +316,10 @@ class _CursorAdapter:
 class _ConnectionAdapter:
     """Wraps sqlite3.Connection to match the oracledb.Connection interface."""
 
+    __slots__ = ("_con",)
+
     def __init__(self, con: sqlite3.Connection) -> None:
         self._con = con
-        self._pending_proxies: list[_VarProxy] = []
 
     def cursor(self) -> _CursorAdapter:
         return _CursorAdapter(self._con.cursor(), self)
@@ -211,6 +338,14 @@ class _ConnectionAdapter:
 # Bootstrap
 # ---------------------------------------------------------------------------
 
+_ADD_COLUMN_RE = re.compile(r"\s*ALTER\s+TABLE\s+(\w+)\s+ADD\s+COLUMN\s+(\w+)", re.IGNORECASE)
+
+
+def _has_column(cur: sqlite3.Cursor, table: str, column: str) -> bool:
+    cur.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in cur.fetchall())
+
+
 def init_sqlite() -> None:
     """Create schema + seed data in the SQLite dev database."""
     con = sqlite3.connect(SQLITE_PATH)
@@ -218,10 +353,20 @@ def init_sqlite() -> None:
     cur = con.cursor()
     cur.execute("PRAGMA foreign_keys = ON")
     for stmt in SQLITE_DDL:
+        m = _ADD_COLUMN_RE.match(stmt)
+        if m and _has_column(cur, m.group(1), m.group(2)):
+            continue
         try:
             cur.execute(stmt.strip())
         except sqlite3.Error as exc:
             logger.warning("SQLite DDL: %s", exc)
+    # Seed default thresholds (INSERT OR IGNORE = no-op if already present)
+    cur.executemany(
+        "INSERT OR IGNORE INTO config "
+        "(metric_type, environment, warning_threshold, critical_threshold) "
+        "VALUES (?, ?, ?, ?)",
+        DEFAULT_THRESHOLDS,
+    )
     con.commit()
     con.close()
     logger.info("SQLite dev DB ready → %s", Path(SQLITE_PATH).resolve())
@@ -231,12 +376,69 @@ def init_sqlite() -> None:
 # Connection helpers
 # ---------------------------------------------------------------------------
 
+# Applied once per pooled connection.  WAL lets the dashboard's readers run
+# alongside an ingest write; the rest trade a little durability (dev DB)
+# and memory for fewer syscalls and page reads.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA mmap_size = 268435456",    # 256 MiB
+    "PRAGMA cache_size = -32768",      # 32 MiB
+)
+
+# LIFO stack of idle connections, so the most recently used (warmest page
+# cache) is handed out next.
+_idle: list[sqlite3.Connection] = []
+_idle_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    # A pooled connection serves one request at a time, but FastAPI may
+    # open, use and release it from different threadpool workers.
+    con = sqlite3.connect(
+        SQLITE_PATH,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False,
+    )
+    for pragma in _CONNECTION_PRAGMAS:
+        con.execute(pragma)
+    return con
+
+
+def _acquire() -> sqlite3.Connection:
+    with _idle_lock:
+        if _idle:
+            return _idle.pop()
+    return _connect()
+
+
+def _release(con: sqlite3.Connection) -> None:
+    with _idle_lock:
+        if len(_idle) < SQLITE_POOL_SIZE:
+            _idle.append(con)
+            return
+    con.close()
+
+
+def close_sqlite_pool() -> None:
+    """Close every idle pooled connection (called at shutdown)."""
+    with _idle_lock:
+        idle = _idle[:]
+        _idle.clear()
+    for con in idle:
+        con.close()
+
+
 @contextmanager
 def get_sqlite_connection():
-    """Context manager that yields a wrapped SQLite connection."""
-    con = sqlite3.connect(SQLITE_PATH, detect_types=sqlite3.PARSE_DECLTYPES)
-    con.row_factory = sqlite3.Row
-    con.execute("PRAGMA foreign_keys = ON")
+    """
+    Context manager that yields a wrapped SQLite connection from the pool.
+
+    Each use is one transaction: committed on success, rolled back on error,
+    then the connection goes back to the pool rather than being closed.
+    """
+    con = _acquire()
     adapter = _ConnectionAdapter(con)
     try:
         yield adapter
@@ -245,7 +447,7 @@ def get_sqlite_connection():
         con.rollback()
         raise
     finally:
-        con.close()
+        _release(con)
 
 
 def get_sqlite_db():
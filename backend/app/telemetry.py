@@ -0,0 +1,100 @@
+"""
+telemetry.py — Prometheus instrumentation for RecSignal.
+
+Tracks how long requests wait for a pooled Oracle connection versus how long
+their SQL takes, which is what tells an undersized pool apart from slow
+queries.  prometheus_client is optional: without it every helper here is a
+no-op and no scrape endpoint is mounted.
+
+Exposed (when installed) at ``/prometheus`` by main.py:
+
+  recsignal_db_connections_requested_total       pool.acquire() calls
+  recsignal_db_connections_acquired_total        ... that returned a connection
+  recsignal_db_connections_unacquired_error_total ... that raised
+  recsignal_db_acquire_seconds                   time spent in pool.acquire()
+  recsignal_db_query_seconds{operation}          execute + fetch per operation
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import nullcontext
+from typing import Any, ContextManager, Optional
+
+try:
+    from prometheus_client import Counter, Histogram, make_asgi_app
+except ImportError:  # optional dependency
+    Counter = Histogram = make_asgi_app = None
+
+PROMETHEUS_ENABLED = Counter is not None
+
+# Acquire waits are normally sub-millisecond; the tail is what matters.
+_ACQUIRE_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+# ---------------------------------------------------------------------------
+# Metric objects
+# ---------------------------------------------------------------------------
+
+if PROMETHEUS_ENABLED:
+    _CONNECTIONS_REQUESTED = Counter(
+        "recsignal_db_connections_requested", "Connections requested from the Oracle pool"
+    )
+    _CONNECTIONS_ACQUIRED = Counter(
+        "recsignal_db_connections_acquired", "Connections handed out by the Oracle pool"
+    )
+    _CONNECTIONS_UNACQUIRED_ERROR = Counter(
+        "recsignal_db_connections_unacquired_error",
+        "Pool acquire() calls that raised instead of returning a connection",
+    )
+    _ACQUIRE_SECONDS = Histogram(
+        "recsignal_db_acquire_seconds",
+        "Time spent waiting in pool.acquire()",
+        buckets=_ACQUIRE_BUCKETS,
+    )
+    _QUERY_SECONDS = Histogram(
+        "recsignal_db_query_seconds",
+        "Time spent executing and fetching SQL, by operation",
+        ["operation"],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+def acquire_connection(pool: Any) -> Any:
+    """``pool.acquire()``, counted and timed."""
+    if not PROMETHEUS_ENABLED:
+        return pool.acquire()
+    _CONNECTIONS_REQUESTED.inc()
+    start = time.perf_counter()
+    try:
+        con = pool.acquire()
+    except Exception:
+        _CONNECTIONS_UNACQUIRED_ERROR.inc()
+        raise
+    _ACQUIRE_SECONDS.observe(time.perf_counter() - start)
+    _CONNECTIONS_ACQUIRED.inc()
+    return con
+
+
+def query_timer(operation: str) -> ContextManager:
+    """
+    Context manager timing the SQL of one *operation* (a fixed, low-
+    cardinality name such as ``"metrics_history"``).
+
+    Usage::
+
+        with query_timer("metrics_history"):
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+    """
+    if not PROMETHEUS_ENABLED:
+        return nullcontext()
+    return _QUERY_SECONDS.labels(operation).time()
+
+
+def metrics_app() -> Optional[Any]:
+    """ASGI app serving the Prometheus text format, or None if not installed."""
+    return make_asgi_app() if PROMETHEUS_ENABLED else None
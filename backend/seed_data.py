@@ -18,6 +18,11 @@ import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import numpy as np
+except ImportError:  # optional; the pure-Python generator below is the fallback
+    np = None
+
 # ── locate the DB ────────────────────────────────────────────────────────────
 SQLITE_PATH = os.getenv("SQLITE_PATH", "recsignal_dev.db")
 
@@ -26,18 +31,29 @@ if not Path(SQLITE_PATH).exists():
     sys.exit(1)
 
 random.seed(42)          # reproducible
+_rng = np.random.default_rng(42) if np is not None else None
 
 # ── connect ──────────────────────────────────────────────────────────────────
 con = sqlite3.connect(SQLITE_PATH)
 con.row_factory = sqlite3.Row
 con.execute("PRAGMA foreign_keys = ON")
+# Bulk-load settings: the seed is throwaway dev data and re-runnable, so skip
+# the fsyncs and keep the sort/temp work in memory.
+con.execute("PRAGMA journal_mode = WAL")
+con.execute("PRAGMA synchronous = OFF")
+con.execute("PRAGMA temp_store = MEMORY")
+con.execute("PRAGMA cache_size = -65536")   # 64 MiB
 cur = con.cursor()
 
+# The whole seed is one transaction, committed at the end.
+cur.execute("BEGIN IMMEDIATE")
+# Check foreign keys once at COMMIT rather than after every inserted row.
+cur.execute("PRAGMA defer_foreign_keys = ON")
+
 # ── wipe existing mock data ───────────────────────────────────────────────────
 cur.execute("DELETE FROM alerts")
 cur.execute("DELETE FROM metrics")
 cur.execute("DELETE FROM servers")
-con.commit()
 print("Cleared existing server / metric / alert rows.")
 
 # ── SERVERS ───────────────────────────────────────────────────────────────────
@@ -63,16 +79,16 @@ SERVERS = [
     ("prod-ora-02.internal",   "PROD", "ORACLE"),
 ]
 
-server_ids: dict[str, int] = {}
+cur.executemany(
+    "INSERT INTO servers (hostname, environment, type, active) VALUES (?,?,?,1)",
+    SERVERS,
+)
+# The servers table was emptied above, so every row is one of ours.
+server_ids: dict[str, int] = {
+    row["hostname"]: row["id"] for row in cur.execute("SELECT id, hostname FROM servers")
+}
 for hostname, env, stype in SERVERS:
-    cur.execute(
-        "INSERT INTO servers (hostname, environment, type, active) VALUES (?,?,?,1)",
-        (hostname, env, stype),
-    )
-    server_ids[hostname] = cur.lastrowid
-    print(f"  Server: {hostname} [{env}/{stype}] id={cur.lastrowid}")
-
-con.commit()
+    print(f"  Server: {hostname} [{env}/{stype}] id={server_ids[hostname]}")
 
 # ── METRIC PROFILES ───────────────────────────────────────────────────────────
 # Each entry: (metric_type, label, base_value, noise, trend_per_hour)
@@ -149,6 +165,8 @@ def _clamp(v: float) -> float:
 def _generate_series(base: float, noise: float, trend: float, n: int,
                      override_final: float | None) -> list[float]:
     """Generate n data points. If override_final is set, the last value equals it."""
+    if np is not None:
+        return _generate_series_np(base, noise, trend, n, override_final)
     values = []
     v = base
     for i in range(n):
@@ -164,27 +182,56 @@ def _generate_series(base: float, noise: float, trend: float, n: int,
     return values
 
 
-metric_rows = []
-for hostname, env, stype in SERVERS:
-    sid = server_ids[hostname]
-    profiles = UNIX_PROFILES if stype == "UNIX" else ORACLE_PROFILES
-    server_overrides = OVERRIDES.get(hostname, {})
-    n = int((HOURS_BACK * 60) / INTERVAL_MIN)
+def _generate_series_np(base: float, noise: float, trend: float, n: int,
+                        override_final: float | None) -> list[float]:
+    """
+    NumPy version of _generate_series: the random walk is one cumsum.
+    Every step works in place on the one buffer normal() returns.
+    """
+    values = _rng.normal(trend * (INTERVAL_MIN / 60), noise * 0.3, n)
+    np.cumsum(values, out=values)
+    values += base
+    np.clip(values, 0.0, 100.0, out=values)
+    if override_final is not None:
+        ramp_start = max(0, n - n // 5)
+        frac = np.arange(n - ramp_start) / max(1, n - 1 - ramp_start)
+        values[ramp_start:] = np.clip(
+            values[ramp_start - 1] * (1 - frac) + override_final * frac, 0.0, 100.0
+        )
+        values[-1] = override_final
+    return values.round(2).tolist()
 
-    for metric_type, label, base, noise, trend in profiles:
-        override_val = server_overrides.get((metric_type, label))
-        series = _generate_series(base, noise, trend, n, override_val)
 
-        for i, val in enumerate(series):
-            ts = NOW - timedelta(minutes=(n - 1 - i) * INTERVAL_MIN)
-            metric_rows.append((sid, metric_type, round(val, 2), label, ts))
+N_SAMPLES = int((HOURS_BACK * 60) / INTERVAL_MIN)
+# Every series shares the same sample times, oldest first.
+TIMESTAMPS = [NOW - timedelta(minutes=(N_SAMPLES - 1 - i) * INTERVAL_MIN) for i in range(N_SAMPLES)]
+
+
+# (server_id, metric_type, label) -> most recent value, filled in by
+# _metric_rows() as it generates each series; the alert scenarios use it.
+latest_values: dict[tuple, float] = {}
+
+
+def _metric_rows():
+    """Yield metric rows one series at a time, so executemany streams them."""
+    for hostname, env, stype in SERVERS:
+        sid = server_ids[hostname]
+        profiles = UNIX_PROFILES if stype == "UNIX" else ORACLE_PROFILES
+        server_overrides = OVERRIDES.get(hostname, {})
+
+        for metric_type, label, base, noise, trend in profiles:
+            override_val = server_overrides.get((metric_type, label))
+            series = _generate_series(base, noise, trend, N_SAMPLES, override_val)
+            latest_values[(sid, metric_type, label)] = round(series[-1], 2)
+            for val, ts in zip(series, TIMESTAMPS):
+                yield sid, metric_type, round(val, 2), label, ts
+
 
 cur.executemany(
     "INSERT INTO metrics (server_id, metric_type, value, label, timestamp) VALUES (?,?,?,?,?)",
-    metric_rows,
+    _metric_rows(),
 )
-con.commit()
-print(f"\nInserted {len(metric_rows):,} metric rows across {len(SERVERS)} servers.")
+print(f"\nInserted {cur.rowcount:,} metric rows across {len(SERVERS)} servers.")
 
 # ── FETCH THRESHOLDS ──────────────────────────────────────────────────────────
 cur.execute("SELECT metric_type, environment, warning_threshold, critical_threshold FROM config")
@@ -213,20 +260,16 @@ ALERT_SCENARIOS = [
     ("dev-unix-01.internal","CPU_LOAD",            "LOAD_1M",  "RESOLVED",     None),
 ]
 
-alert_count = 0
+server_envs = {hostname: env for hostname, env, _ in SERVERS}
+
+alert_rows = []
 for hostname, metric, label, status, ack_by in ALERT_SCENARIOS:
     sid  = server_ids[hostname]
-    env  = next(e for h, e, _ in SERVERS if h == hostname)
+    env  = server_envs[hostname]
     warn, crit = thresholds.get((metric, env), (75, 90))
 
-    # Look up the most recent actual value for this metric/label
-    cur.execute(
-        "SELECT value FROM metrics WHERE server_id=? AND metric_type=? AND label=? "
-        "ORDER BY timestamp DESC LIMIT 1",
-        (sid, metric, label),
-    )
-    row = cur.fetchone()
-    value = float(row["value"]) if row else crit + 1
+    # Most recent actual value for this metric/label
+    value = latest_values.get((sid, metric, label), crit + 1)
 
     severity = "CRITICAL" if value >= crit else "WARNING"
     message  = (
@@ -238,19 +281,20 @@ for hostname, metric, label, status, ack_by in ALERT_SCENARIOS:
     resolved_at = (NOW - timedelta(minutes=random.randint(10, 60))
                    if status == "RESOLVED" else None)
 
-    cur.execute(
-        """INSERT INTO alerts
-           (server_id, metric, severity, label, value, message,
-            status, acknowledged_by, created_at, resolved_at)
-           VALUES (?,?,?,?,?,?,?,?,?,?)""",
+    alert_rows.append(
         (sid, metric, severity, label, round(value, 2),
-         message, status, ack_by, created_at, resolved_at),
+         message, status, ack_by, created_at, resolved_at)
     )
-    alert_count += 1
     print(f"  Alert: [{severity}] {hostname} / {metric} / {label} → {status}")
 
-con.commit()
-print(f"\nInserted {alert_count} alerts.")
+cur.executemany(
+    """INSERT INTO alerts
+       (server_id, metric, severity, label, value, message,
+        status, acknowledged_by, created_at, resolved_at)
+       VALUES (?,?,?,?,?,?,?,?,?,?)""",
+    alert_rows,
+)
+print(f"\nInserted {len(alert_rows)} alerts.")
 
 # ── SERVER / PATH THRESHOLD OVERRIDES ─────────────────────────────────────────
 # Per-server and per-path thresholds.